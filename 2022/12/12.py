@@ -1,13 +1,17 @@
 #!/usr/bin/env python
-import heapq
+import pathlib
 import sys
 import time
-from dataclasses import dataclass
 from typing import Iterable
 from pathlib import Path
 
 import aocd
 
+# add flatgrid to path
+sys.path.append(str(pathlib.Path(__file__).parents[2]))
+
+import flatgrid
+
 
 def height(letter):
     if letter == "S":
@@ -17,136 +21,63 @@ def height(letter):
     return ord(letter) - ord("a")
 
 
-@dataclass(order=True)
-class Node:
-    distance: int = sys.maxsize
-    coord: tuple = (0, 0)
-    height: int = 0
-    visited: bool = False
-
-    def __hash__(self):
-        return hash(self.coord)
-
-
-@dataclass
-class Grid:
-    nodes: set[Node]
-    array: list[list[Node]]
-    start: Node
-    end: Node
-    prev: Node = None
-
+class Grid(flatgrid.Grid):
     def __init__(self, rows):
-        self.nodes = set()
-        self.array = []
-
-        def build(letter="", **args):
-            node = Node(**args)
-            if letter == "S":
-                self.start = node
-            elif letter == "E":
-                self.end = node
-            self.nodes.add(node)
-            return node
-
-        self.array = [
-            [
-                build(coord=(x, y), height=height(c), letter=c)
-                for (x, c) in enumerate(row)
-            ]
-            for (y, row) in enumerate(rows)
-        ]
-
-        self.start.distance = 0
-
-    def neighbors(self, node: Node):
-        """
-        All neighbors for node.
-        """
-        x, y = node.coord
-        for dx, dy in (-1, 0), (1, 0), (0, -1), (0, 1):
-            nx, ny = x + dx, y + dy
-            if nx < 0 or ny < 0:
-                continue
-            try:
-                yield self.array[y + dy][x + dx]
-            except IndexError:
-                pass
+        super().__init__(rows)
+        self.start = self.find("S")
+        self.end = self.find("E")
+        self.heights = bytes(height(chr(c)) for c in self.letters)
 
-    def incoming(self, node: Node):
+    def incoming(self, node: int):
         """
         All nodes that can reach this node.
         """
+        heights = self.heights
         for n in self.neighbors(node):
-            if node.height <= n.height + 1:
-                yield n
+            if heights[node] <= heights[n] + 1:
+                yield n, 1
 
-    def outgoing(self, node: Node):
+    def outgoing(self, node: int):
         """
         All nodes that can be reached by this node.
         """
-        max_height = node.height + 1
+        max_height = self.heights[node] + 1
         for n in self.neighbors(node):
-            if n.height <= max_height:
-                yield n
+            if self.heights[n] <= max_height:
+                yield n, 1
 
     def display(
         self,
         pending,
         pathset0: Iterable[tuple[int, int]] = (),
-        pathset: Iterable[Node] = (),
+        pathset: Iterable[int] = (),
     ):
         pathset0 = set(pathset0)
         pathset = set(pathset)
         pending = set(pending)
         print("\N{MOUNTAIN}")
-        for row in grid.array:
-            for col in row:
-                if col == grid.end:
+        for y in range(self.height):
+            for x in range(self.width):
+                col = self.index(x, y)
+                if col == self.end:
                     char = "\N{SNOWMAN}"
-                elif col == grid.start:
+                elif col == self.start:
                     char = "\N{WORLD MAP}"
-                elif col.coord in pathset0:
+                elif (x, y) in pathset0:
                     char = "\N{CANDLE}"
                 elif col in pathset:
                     char = "\N{SLEUTH OR SPY}"
                 elif col in pending:
                     char = "+"
-                elif col.visited:
+                elif self.visited(col):
                     # print(" ", end="")
-                    char = chr(ord("0") + col.distance % 10)
+                    char = chr(ord("0") + self.distance(col) % 10)
                 else:
                     char = "."
                 print(char, end="")
             print()
 
-    def shortest(self, start, goal, connected):
-        # nodes.visited and nodes.distance should be reset before calling
-        display_distance = 0
-        unvisited = [(start.distance, start)]
-        while unvisited:
-            original_priority, node = heapq.heappop(unvisited)
-            if original_priority != node.distance:
-                continue
-            if node.visited:
-                continue
-            if display_distance < node.distance:
-                display_distance = node.distance
-                print("\033[2J\033[H")  # clear screen and move to home
-                self.display(n for _, n in unvisited)
-                sys.stdout.flush()
-
-                time.sleep(0.01)
-            node.visited = True
-            if node == goal:
-                break
-
-            for next in connected(node):
-                if not next.visited:
-                    next.distance = min(node.distance + 1, next.distance)
-                    heapq.heappush(unvisited, (next.distance, next))
-
-    def climbdown(self, start: Node, goal: Node):
+    def climbdown(self, start: int, goal: int):
         """
         After calling shortest, traverse backwards from goal.
         """
@@ -156,10 +87,10 @@ class Grid:
         while current != start and i < 600:
             try:
                 current = sorted(
-                    n
-                    for n in grid.incoming(current)
-                    if n.distance == current.distance - 1
-                )[-1]
+                    (self.distance(n), n)
+                    for n, _ in self.incoming(current)
+                    if self.distance(n) == self.distance(current) - 1
+                )[-1][1]
                 path.append(current)
             except IndexError:
                 break
@@ -179,22 +110,22 @@ abdefghi
 
 grid = Grid(example)
 grid.display(set())
-print(grid.start, grid.end)
+print(grid.coord(grid.start), grid.coord(grid.end))
 
-assert grid.array[3][4].coord == (4, 3)
+assert grid.coord(grid.index(4, 3)) == (4, 3)
 
 data = Path("input.txt").read_text().splitlines()
 
 grid = Grid(data)
 
-grid.shortest(grid.start, grid.end, grid.outgoing)
+grid.shortest(grid.start, grid.outgoing, grid.end, show=True)
 path = grid.climbdown(grid.start, grid.end)
-path0 = [p.coord for p in path]
+path0 = [grid.coord(p) for p in path]
 
 print("\033[2J\033[H")  # clear screen and move to home
 grid.display(set(), set(path0), set())
 print()
-print("Steps to summit:", grid.end.distance, grid.end)
+print("Steps to summit:", grid.distance(grid.end), grid.coord(grid.end))
 sys.stdout.flush()
 time.sleep(1)
 
@@ -204,14 +135,11 @@ time.sleep(1)
 # part 2: shortest path from any a to end
 grid = Grid(data)
 
-grid.end.distance = 0
-grid.start.distance = sys.maxsize
-
-grid.shortest(grid.end, grid.start, grid.incoming)
+grid.shortest(grid.end, grid.incoming, grid.start, show=True)
 
-all_as = sorted(n for n in grid.nodes if n.height == 0)
+all_as = sorted((grid.distance(n), n) for n in range(grid.size) if grid.heights[n] == 0)
 
-path1 = grid.climbdown(grid.end, all_as[0])
+path1 = grid.climbdown(grid.end, all_as[0][1])
 
 for i in range(max(len(path0), len(path1))):
     print("\033[2J\033[H")  # clear screen and move to home
@@ -219,15 +147,15 @@ for i in range(max(len(path0), len(path1))):
     sys.stdout.flush()
     time.sleep(0.01)
 
-print("Target:", grid.end)
-print("Original starting point:", grid.start)
-print("Best starting points:", all_as[:10])
+print("Target:", grid.coord(grid.end))
+print("Original starting point:", grid.coord(grid.start), grid.distance(grid.start))
+print("Best starting points:", [(d, grid.coord(n)) for d, n in all_as[:10]])
 
 # import networkx
 
 # digraph = networkx.DiGraph()
-# for node in grid.nodes:
-#     for neighbor in grid.outgoing(node):  # .neighbors():
+# for node in range(grid.size):
+#     for neighbor, _ in grid.outgoing(node):  # .neighbors():
 #         digraph.add_edge(node, neighbor)
 
 # from networkx.algorithms import shortest_path
@@ -3,8 +3,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import aocd
+import pathlib
+import sys
 from itertools import *
 
+# add parallel to path
+sys.path.append(str(pathlib.Path(__file__).parents[2]))
+
+from parallel import pmap
+
 
 try:
     pairwise
@@ -240,10 +247,15 @@ print(ystarts)
 
 
 SEARCH_MAX = 4000000
+BAND = 20000
 all_sensors = sensors
-for y0, y1 in pairwise(ystarts):
-    if y1 < 0 or y0 > SEARCH_MAX:
-        continue
+
+
+def scan_band(band):
+    """
+    Uncovered x, y positions for y in band.
+    """
+    y0, y1 = band
 
     # limit to sensors overlapping current y coordinates
     sensors = [
@@ -252,21 +264,28 @@ for y0, y1 in pairwise(ystarts):
         if merge(*sorted([range(y0, y1), range(s.ymin, s.ymax)], key=lambda r: r.start))
     ]
 
-    # approximately doubles speed
-    print(f"⛰ Range {y0}-{y1} with {len(sensors)}")
-
-    for y in range(max(y0, 0), min(y1, SEARCH_MAX)):
+    found = []
+    for y in range(y0, y1):
         ranges = get_ranges(sensors, y)
-        # allranges = get_ranges(all_sensors, y)
-        # if ranges != allranges:
-        # print("oops", ranges, allranges, y)
         for l, r in pairwise(merge_4(ranges)):
             if 0 < l.stop < r.start < SEARCH_MAX:
-                print("Ranges:", ranges)
-                print("Found", l, r, y * 1j)
-                print("Part 2", l.stop * 4000000 + y)
-        if y % 1000 == 0:
-            now = int(time.time())
-            if now > last:
-                last = int(time.time())
-                print(y, "%0.2f/s" % (y / (now - begin)))
+                found.append((l.stop, y))
+    return found
+
+
+# bands between sensor starts are cut up further so every worker stays busy
+bands = []
+for y0, y1 in pairwise(ystarts):
+    if y1 < 0 or y0 > SEARCH_MAX:
+        continue
+    y0, y1 = max(y0, 0), min(y1, SEARCH_MAX)
+    bands.extend((y, min(y + BAND, y1)) for y in range(y0, y1, BAND))
+
+print(f"⛰ {len(bands)} bands")
+
+for found in pmap(scan_band, bands)[0]:
+    for x, y in found:
+        print("Found", x, y * 1j)
+        print("Part 2", x * 4000000 + y)
+
+print("%0.2fs" % (time.time() - begin))
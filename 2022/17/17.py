@@ -173,6 +173,87 @@ def pile(jets, limit=2022):
             print("At step %d, %0.2f%%" % (step, (step / limit) * 100))
 
 
+## Bitboard version
+
+# Each tower row is a 7-bit int in a bytearray, bit 6 on the left. Rocks are
+# tuples of row masks, bottom row first.
+
+WIDTH = 7
+
+
+def rock_masks(rock):
+    """
+    Row masks for rock at every x where it fits, indexed by x.
+    """
+    rows = [
+        sum(1 << (WIDTH - 1 - i) for i, c in enumerate(row) if c == "#")
+        for row in reversed(rock)
+    ]
+    return [tuple(row >> x for row in rows) for x in range(WIDTH - len(rock[0]) + 1)]
+
+
+ROCK_MASKS = [rock_masks(rock) for rock in rocks]
+
+
+def pile_bits(jets, limit=2022, depth=32):
+    """
+    Height of the tower after limit rocks. A cycle is a repeat of (next rock,
+    next jet, top depth rows); whole cycles are skipped arithmetically.
+    """
+    pushes = [-1 if jet == "<" else 1 for jet in jets.strip()]
+    tower = bytearray()
+    height = 0
+    jet = 0
+    seen = {}
+    cycled = False
+    skipped = 0
+
+    step = 0
+    while step < limit:
+        positions = ROCK_MASKS[step % len(ROCK_MASKS)]
+        x = 2
+        y = height + 3
+        rock_height = len(positions[0])
+        if len(tower) < y + rock_height:
+            tower.extend(bytes(y + rock_height - len(tower)))
+
+        while True:
+            # across
+            nx = x + pushes[jet]
+            jet = (jet + 1) % len(pushes)
+            if 0 <= nx < len(positions) and not any(
+                tower[y + i] & m for i, m in enumerate(positions[nx])
+            ):
+                x = nx
+
+            # down
+            if y == 0 or any(
+                tower[y - 1 + i] & m for i, m in enumerate(positions[x])
+            ):
+                break
+            y -= 1
+
+        for i, m in enumerate(positions[x]):
+            tower[y + i] |= m
+        height = max(height, y + rock_height)
+        step += 1
+
+        if not cycled:
+            skyline = bytes(tower[max(0, height - depth) : height])
+            key = (step % len(ROCK_MASKS), jet, skyline)
+            if key in seen:
+                cycled = True
+                last_step, last_height = seen[key]
+                steps_per_cycle = step - last_step
+                cycles = (limit - step) // steps_per_cycle
+                skipped = cycles * (height - last_height)
+                step += cycles * steps_per_cycle
+                print(f"cycle of {steps_per_cycle} rocks from step {last_step}")
+            seen[key] = step, height
+
+    return height + skipped
+
+
 puzzle = Puzzle(2022, 17)
 
 print("Pile 'em high")
@@ -180,3 +261,10 @@ pile(puzzle.input_data)
 print("END")
 
 pile(puzzle.input_data, limit=1000000000000)
+
+
+with timeme("Bitboard 2022"):
+    print("Height", pile_bits(puzzle.input_data))
+
+with timeme("Bitboard 1e12"):
+    print("Height", pile_bits(puzzle.input_data, limit=1000000000000))
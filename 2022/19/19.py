@@ -4,14 +4,21 @@ from __future__ import annotations
 
 import collections as c
 import math
+import pathlib
 import pprint
 import re
 import sys
+import time
 from functools import partial
 from typing import Any
 
 import aocd
 
+# add parallel to path
+sys.path.append(str(pathlib.Path(__file__).parents[2]))
+
+from parallel import pmap
+
 try:
     from functools import cache
 except:
@@ -256,6 +263,126 @@ if False:
     print(scores)
     print(math.prod(b for a, b in scores))
 
+
+def most_geodes(b_idx, turns=24):
+    """
+    Depth-first search over "which robot to build next", waiting as many
+    turns as it takes to afford it. Geodes are counted when a geode robot is
+    built, for every turn it has left.
+    """
+    blueprint = BLUEPRINTS[b_idx][1]
+    ore_ore = blueprint["ore"]["ore"]
+    clay_ore = blueprint["clay"]["ore"]
+    obsidian_ore = blueprint["obsidian"]["ore"]
+    obsidian_clay = blueprint["obsidian"]["clay"]
+    geode_ore = blueprint["geode"]["ore"]
+    geode_obsidian = blueprint["geode"]["obsidian"]
+    caps = max_robots(b_idx)
+
+    best = 0
+
+    def wait(cost, have, rate):
+        # turns until affordable, plus one to build
+        return max(0, -(-(cost - have) // rate)) + 1
+
+    def bound(turns, obsidian, obsidian_r, geodes):
+        # free ore and clay: a new obsidian robot every turn, and a geode
+        # robot whenever there is obsidian for it
+        for t in range(turns - 1, 0, -1):
+            if obsidian >= geode_obsidian:
+                obsidian += obsidian_r - geode_obsidian
+                geodes += t
+            else:
+                obsidian += obsidian_r
+            obsidian_r += 1
+        return geodes
+
+    def dfs(turns, ore, clay, obsidian, ore_r, clay_r, obsidian_r, geodes):
+        nonlocal best
+        if geodes > best:
+            best = geodes
+        if bound(turns, obsidian, obsidian_r, geodes) <= best:
+            return
+
+        spend = max_spend(b_idx, turns)
+
+        if obsidian_r:
+            w = max(
+                wait(geode_ore, ore, ore_r), wait(geode_obsidian, obsidian, obsidian_r)
+            )
+            if w < turns:
+                dfs(
+                    turns - w,
+                    ore + ore_r * w - geode_ore,
+                    clay + clay_r * w,
+                    obsidian + obsidian_r * w - geode_obsidian,
+                    ore_r,
+                    clay_r,
+                    obsidian_r,
+                    geodes + turns - w,
+                )
+
+        if (
+            clay_r
+            and obsidian_r < caps["obsidian"]
+            and obsidian + obsidian_r * turns < spend["obsidian"]
+        ):
+            w = max(wait(obsidian_ore, ore, ore_r), wait(obsidian_clay, clay, clay_r))
+            if w < turns:
+                dfs(
+                    turns - w,
+                    ore + ore_r * w - obsidian_ore,
+                    clay + clay_r * w - obsidian_clay,
+                    obsidian + obsidian_r * w,
+                    ore_r,
+                    clay_r,
+                    obsidian_r + 1,
+                    geodes,
+                )
+
+        if clay_r < caps["clay"] and clay + clay_r * turns < spend["clay"]:
+            w = wait(clay_ore, ore, ore_r)
+            if w < turns:
+                dfs(
+                    turns - w,
+                    ore + ore_r * w - clay_ore,
+                    clay + clay_r * w,
+                    obsidian + obsidian_r * w,
+                    ore_r,
+                    clay_r + 1,
+                    obsidian_r,
+                    geodes,
+                )
+
+        if ore_r < caps["ore"] and ore + ore_r * turns < spend["ore"]:
+            w = wait(ore_ore, ore, ore_r)
+            if w < turns:
+                dfs(
+                    turns - w,
+                    ore + ore_r * w - ore_ore,
+                    clay + clay_r * w,
+                    obsidian + obsidian_r * w,
+                    ore_r + 1,
+                    clay_r,
+                    obsidian_r,
+                    geodes,
+                )
+
+    dfs(turns, 0, 0, 0, 1, 0, 0, 0)
+    return best
+
+
+begin = time.time_ns()
+geodes, _ = pmap(partial(most_geodes, turns=24), range(len(BLUEPRINTS)))
+scores = [(BLUEPRINTS[n][0], g) for n, g in enumerate(geodes)]
+print(scores)
+print("Quality levels", sum(a * b for a, b in scores))
+scores, _ = pmap(partial(most_geodes, turns=32), range(min(3, len(BLUEPRINTS))))
+print(scores)
+print("Product", math.prod(scores))
+end = time.time_ns()
+print(f"DFS in {(end-begin)/1e9:.02f}s")
+
 example_choices = (
     None,  # 1
     None,  # 2
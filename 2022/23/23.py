@@ -1,9 +1,11 @@
 #!/usr/bin/env python
 
+import time
 from collections import Counter
 from itertools import chain, cycle, islice
 
 import aocd
+import numpy as np
 
 example = """\
 .....
@@ -158,3 +160,99 @@ area = (x1 - x0) * (y1 - y0)
 print(area)
 area_without_elves = area - sum(bool(x == ELF) for x in grid.values())
 print("Area without elves", area_without_elves)
+
+
+## NumPy version
+
+# Elves are a boolean array with at least MARGIN empty cells on every side, so
+# np.roll never wraps an elf around. Only elves two apart and facing each other
+# can propose the same cell, so collisions are one shifted AND per axis.
+
+MARGIN = 2
+GROW = 16
+
+
+def numpy_elves(lines):
+    elves = np.array([[c == ELF for c in line] for line in lines if line])
+    return np.pad(elves, GROW)
+
+
+def numpy_round(elves, order):
+    """
+    One round. Return the new array, grown if needed, and the number of elves
+    that moved.
+    """
+    if (
+        elves[:MARGIN].any()
+        or elves[-MARGIN:].any()
+        or elves[:, :MARGIN].any()
+        or elves[:, -MARGIN:].any()
+    ):
+        elves = np.pad(elves, GROW)
+
+    def at(dy, dx):
+        # elf at (y + dy, x + dx)
+        return np.roll(elves, (-dy, -dx), axis=(0, 1))
+
+    n, s, w, e = at(-1, 0), at(1, 0), at(0, -1), at(0, 1)
+    nw, ne, sw, se = at(-1, -1), at(-1, 1), at(1, -1), at(1, 1)
+
+    free = {
+        "N": ~(n | nw | ne),
+        "S": ~(s | sw | se),
+        "W": ~(w | nw | sw),
+        "E": ~(e | ne | se),
+    }
+
+    waiting = elves & (n | s | w | e | nw | ne | sw | se)
+    proposed = {}
+    for d in order:
+        proposed[d] = waiting & free[d]
+        waiting &= ~proposed[d]
+
+    # blocked by the elf two away proposing the same cell from the other side
+    north = proposed["N"] & ~np.roll(proposed["S"], 2, axis=0)
+    south = proposed["S"] & ~np.roll(proposed["N"], -2, axis=0)
+    west = proposed["W"] & ~np.roll(proposed["E"], 2, axis=1)
+    east = proposed["E"] & ~np.roll(proposed["W"], -2, axis=1)
+
+    moving = north | south | west | east
+    elves = (
+        (elves & ~moving)
+        | np.roll(north, -1, axis=0)
+        | np.roll(south, 1, axis=0)
+        | np.roll(west, -1, axis=1)
+        | np.roll(east, 1, axis=1)
+    )
+    return elves, int(moving.sum())
+
+
+def numpy_empty_ground(elves):
+    rows = np.flatnonzero(elves.any(axis=1))
+    columns = np.flatnonzero(elves.any(axis=0))
+    area = (rows[-1] - rows[0] + 1) * (columns[-1] - columns[0] + 1)
+    return int(area - elves.sum())
+
+
+def numpy_diffuse(lines, limit=10000):
+    """
+    Return (empty ground after 10 rounds, first round where no elf moves).
+    """
+    elves = numpy_elves(lines)
+    directions = list(compass)
+    empty_ground = None
+    for turn in range(1, limit):
+        order = directions[(turn - 1) % 4 :] + directions[: (turn - 1) % 4]
+        elves, moves = numpy_round(elves, order)
+        if turn == 10:
+            empty_ground = numpy_empty_ground(elves)
+        if moves == 0:
+            return empty_ground, turn
+    return empty_ground, None
+
+
+begin = time.time_ns()
+empty_ground, stopped = numpy_diffuse(example1.splitlines())
+end = time.time_ns()
+print("NumPy empty ground after 10", empty_ground, "stopped at", stopped)
+print(f"{stopped} rounds in {(end-begin)/1e6:.02f}ms")
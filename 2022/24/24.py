@@ -2,6 +2,7 @@
 
 from collections import UserList
 from itertools import product
+import math
 import time
 from networkx import DiGraph
 from functools import cache
@@ -260,3 +261,92 @@ t1, g1 = bfs(goal, t0, start)
 assert g1 == start
 t2, g2 = bfs(start, t1, goal)
 assert g2 == goal
+
+
+## Bitmask version
+
+# The whole valley is one int, bit row * stride + column, with an always-closed
+# guard column so that shifting by one never wraps into the next row. Storms
+# repeat every lcm(width, height) minutes, so the open cells for each minute of
+# one period are computed once.
+
+
+class BitValley:
+    def __init__(self, blizzard: Blizzard):
+        bbd = blizzard.bbd
+        width = blizzard.x1 - blizzard.x0 - 2
+        height = blizzard.y1 - blizzard.y0 - 2
+        self.stride = stride = width + 1
+        self.period = math.lcm(width, height)
+
+        def mask(cells, storm):
+            return sum(1 << i for i, cell in enumerate(cells) if cell == storm)
+
+        # by row; north and south storms are stored by column
+        east = [mask(row, STORM_EAST) for row in bbd[blizz[STORM_EAST]]]
+        west = [mask(row, STORM_WEST) for row in bbd[blizz[STORM_WEST]]]
+        columns = [*zip(*bbd[blizz[STORM_NORTH]])]
+        north = [mask(row, STORM_NORTH) for row in columns]
+        columns = [*zip(*bbd[blizz[STORM_SOUTH]])]
+        south = [mask(row, STORM_SOUTH) for row in columns]
+
+        full_row = (1 << width) - 1
+
+        def rotate(row, n):
+            n %= width
+            return ((row << n) | (row >> (width - n))) & full_row
+
+        self.open = []
+        for t in range(self.period):
+            valley = 0
+            for y in range(height):
+                blocked = (
+                    rotate(east[y], t)
+                    | rotate(west[y], -t)
+                    | north[(y + t) % height]
+                    | south[(y - t) % height]
+                )
+                valley |= (full_row & ~blocked) << (y * stride)
+            self.open.append(valley)
+
+        # cells next to the entrance and the exit
+        self.top_left = 1
+        self.bottom_right = 1 << ((height - 1) * stride + width - 1)
+
+    def crossing(self, t_start, entry, exit):
+        """
+        Minute the expedition steps out next to exit, having waited outside
+        entry since t_start.
+        """
+        stride = self.stride
+        period = self.period
+        open = self.open
+        reachable = 0
+        for t in range(t_start + 1, t_start + 1 + len(open) * stride):
+            reachable = (
+                reachable
+                | reachable << 1
+                | reachable >> 1
+                | reachable << stride
+                | reachable >> stride
+                | entry
+            ) & open[t % period]
+            if reachable & exit:
+                return t + 1
+        raise ValueError("No way through")
+
+    def trip(self):
+        """
+        There, back for the snacks, and there again.
+        """
+        t0 = self.crossing(0, self.top_left, self.bottom_right)
+        t1 = self.crossing(t0, self.bottom_right, self.top_left)
+        t2 = self.crossing(t1, self.top_left, self.bottom_right)
+        return t0, t1, t2
+
+
+begin = time.time_ns()
+valley = BitValley(Blizzard(grid))
+print("Bitmask trip", valley.trip())
+end = time.time_ns()
+print(f"{valley.period} minute period in {(end-begin)/1e6:.02f}ms")
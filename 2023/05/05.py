@@ -6,6 +6,8 @@ summed.
 
 import pprint
 import re
+import time
+from bisect import bisect_right
 from dataclasses import dataclass
 from itertools import groupby
 from pathlib import Path
@@ -150,6 +152,66 @@ def part_2(seeds, ranges):
         i += min(steps)
 
 
+class IntervalMap:
+    """
+    One almanac layer as sorted, non-overlapping source intervals, for
+    mapping whole [start, stop) ranges at a time.
+    """
+
+    def __init__(self, range_map: RangeMap):
+        self.source, self.dest = range_map.source, range_map.dest
+        spans = sorted(
+            (source, source + size, dest - source)
+            for dest, source, size in range_map.ranges
+        )
+        self.starts = [start for start, _, _ in spans]
+        self.stops = [stop for _, stop, _ in spans]
+        self.offsets = [offset for _, _, offset in spans]
+
+    def map_range(self, start, stop):
+        """
+        Yield the [start, stop) pieces that [start, stop) maps to, split
+        wherever it crosses a mapping boundary.
+        """
+        starts, stops, offsets = self.starts, self.stops, self.offsets
+        # the last interval starting at or before start
+        i = max(bisect_right(starts, start) - 1, 0)
+        while start < stop:
+            if i >= len(starts) or stop <= starts[i]:
+                # past every interval, or before this one: unmapped
+                yield start, stop
+                return
+            if start < starts[i]:
+                yield start, starts[i]
+                start = starts[i]
+            elif start < stops[i]:
+                end = min(stop, stops[i])
+                yield start + offsets[i], end + offsets[i]
+                start = end
+                i += 1
+            else:
+                i += 1
+
+
+def lowest_location(seed_ranges, ranges: list[RangeMap]):
+    """
+    Push [start, stop) seed ranges through every layer; return the lowest
+    location and how many ranges reached the last layer.
+    """
+    layers = [IntervalMap(range_map) for range_map in ranges]
+    for layer in layers:
+        seed_ranges = [
+            piece
+            for start, stop in seed_ranges
+            for piece in layer.map_range(start, stop)
+        ]
+    return min(start for start, _ in seed_ranges), len(seed_ranges)
+
+
+def seed_pairs(seeds):
+    return [(start, start + size) for start, size in zip(seeds[0::2], seeds[1::2])]
+
+
 if __name__ == "__main__":
     seeds, ranges = parse(SAMPLE)
     pprint.pprint(seeds)
@@ -173,6 +235,21 @@ if __name__ == "__main__":
 
     print("\nPart the 2")
 
+    assert lowest_location([(seed, seed + 1) for seed in seeds], ranges)[0] == 35
+    assert lowest_location(seed_pairs(seeds), ranges)[0] == 46
+
+    seeds2, ranges2 = parse(INPUT.open())
+    begin = time.time_ns()
+    print(
+        "Part 1 intervals",
+        lowest_location([(seed, seed + 1) for seed in seeds2], ranges2)[0],
+    )
+    location, pieces = lowest_location(seed_pairs(seeds2), ranges2)
+    end = time.time_ns()
+    print(
+        f"Part 2 intervals {location} from {pieces} ranges in {(end-begin)/1e6:.02f}ms"
+    )
+
     part_2(seeds, ranges)
 
     seeds2, ranges2 = parse(INPUT.open())
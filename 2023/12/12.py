@@ -4,6 +4,8 @@
 On the twelvth day of Christmas
 """
 
+import pathlib
+import sys
 import time
 import aocd
 from rich.console import Console
@@ -11,6 +13,11 @@ import re
 from functools import cache
 from itertools import combinations
 
+# add parallel to path
+sys.path.append(str(pathlib.Path(__file__).parents[2]))
+
+from parallel import pmap
+
 console = Console()
 
 
@@ -389,3 +396,85 @@ for expected, (line, count) in zip(example2, fiveboard):
     line = re.sub(r"\.+", ".", line).strip(".")
     ans = sliding2(line, count)
     print(f"{ans:8} {ans==expected}\t", line)
+
+
+## Row-counting engine
+
+# A left-to-right DP over each row's bytes. The state after each spring is
+# (group index, length of the run of # in progress) -> number of ways.
+
+OPERATIONAL, DAMAGED = ord("."), ord("#")
+
+
+def count_arrangements(springs: bytes, groups: tuple[int, ...]):
+    """
+    Number of ways to fill in the ?s in springs to give groups, and the most
+    states alive at once.
+    """
+    states = {(0, 0): 1}
+    peak = 1
+    for spring in springs:
+        following = {}
+        for (group, run), ways in states.items():
+            if spring != OPERATIONAL:
+                # damaged: grow the current run, if the group is that long
+                if group < len(groups) and run < groups[group]:
+                    key = (group, run + 1)
+                    following[key] = following.get(key, 0) + ways
+            if spring != DAMAGED:
+                # operational: end any run that matches its group
+                if run == 0:
+                    key = (group, 0)
+                elif run == groups[group]:
+                    key = (group + 1, 0)
+                else:
+                    continue
+                following[key] = following.get(key, 0) + ways
+        states = following
+        peak = max(peak, len(states))
+
+    done = len(groups)
+    ways = states.get((done, 0), 0)
+    if groups:
+        ways += states.get((done - 1, groups[-1]), 0)
+    return ways, peak
+
+
+def count_batch(board, copies=1):
+    """
+    Counts for every (springs, groups) row, unfolded to copies copies, and
+    the most states alive at once in each row.
+    """
+    counts, peaks = [], []
+    for springs, groups in board:
+        ways, peak = count_arrangements(
+            "?".join([springs] * copies).encode(), groups * copies
+        )
+        counts.append(ways)
+        peaks.append(peak)
+    return counts, peaks
+
+
+assert count_batch(load(example.splitlines()))[0] == [1, 4, 1, 1, 4, 10]
+
+
+def count_unfolded(row):
+    springs, groups = row
+    return count_arrangements("?".join([springs] * 5).encode(), groups * 5)
+
+
+begin = time.time_ns()
+results, _ = pmap(count_unfolded, board)
+end = time.time_ns()
+answers2 = [ways for ways, _ in results]
+if not REAL_INPUT:
+    assert answers2 == example2, answers2
+console.print("Part 2", sum(answers2), f"in {(end-begin)/1e6:.02f}ms")
+
+# the live states are the DP's memory; a row never holds more than its peak
+peaks = [peak for _, peak in results]
+row = max(range(len(board)), key=peaks.__getitem__)
+print(
+    f"rows hold {min(peaks)}-{max(peaks)} states, mean {sum(peaks)/len(peaks):.0f};",
+    f"largest {board[row]}",
+)
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 
 import aocd
+import time
 from itertools import groupby, pairwise
 from rich.console import Console
 
@@ -71,6 +72,52 @@ def go():
     console.print("Part 2", answer)
 
 
+## Bitmask engine
+
+# Each row and each column becomes an int with a bit per #. Rows either side
+# of an axis differ in (a ^ b).bit_count() places, so a board with exactly k
+# smudges reflects where the differences over all mirrored pairs sum to k.
+
+ROCKS = str.maketrans(".#", "01")
+
+
+def bitmasks(board: list[str]):
+    """
+    Row and column ints for board.
+    """
+    rows = [int(row.translate(ROCKS), 2) for row in board]
+    width = len(board[0])
+    cols = [
+        sum(((row >> (width - 1 - x)) & 1) << y for y, row in enumerate(rows))
+        for x in range(width)
+    ]
+    return rows, cols
+
+
+def reflection(lines: list[int], smudges=0):
+    """
+    Number of lines before the first axis with exactly smudges differences,
+    or 0.
+    """
+    for axis in range(1, len(lines)):
+        differences = 0
+        for a, b in zip(lines[axis - 1 :: -1], lines[axis:]):
+            differences += (a ^ b).bit_count()
+            if differences > smudges:
+                break
+        if differences == smudges:
+            return axis
+    return 0
+
+
+def summarize(boards: list[list[str]], smudges=0):
+    total = 0
+    for board in boards:
+        rows, cols = bitmasks(board)
+        total += 100 * reflection(rows, smudges) + reflection(cols, smudges)
+    return total
+
+
 """To summarize your pattern notes, add up the number of columns to the left of
 each vertical line of reflection; to that, also add 100 multiplied by the number
 of rows above each horizontal line of reflection. In the above example, the
@@ -80,3 +127,8 @@ horizontal line has 4 rows above it, a total of 405."""
 
 if __name__ == "__main__":
     go()
+
+    begin = time.time_ns()
+    print("Part 1", summarize(boards), "Part 2", summarize(boards, smudges=1))
+    end = time.time_ns()
+    print(f"bitmasks in {(end-begin)/1e6:.02f}ms")
@@ -155,3 +155,115 @@ for column in columns(data):
 print("Part 2", ans)
 
 display(data)
+
+
+## Bitmask engine
+
+# All round rocks are one int, bit x * height + y: each column's rocks are a
+# run of bits. Cube rocks split every column and row into segments; a tilt
+# counts the rocks in each segment and packs that many against its far end.
+
+
+class Platform:
+    def __init__(self, board: list[str]):
+        self.width, self.height = len(board[0]), len(board)
+        self.rocks = 0
+        cubes = set()
+        for y, row in enumerate(board):
+            for x, c in enumerate(row):
+                if c == "O":
+                    self.rocks |= 1 << self.bit(x, y)
+                elif c == "#":
+                    cubes.add((x, y))
+
+        columns = [[(x, y) for y in range(self.height)] for x in range(self.width)]
+        rows = [[(x, y) for x in range(self.width)] for y in range(self.height)]
+        # north, west, south, east: cells nearest the edge rocks roll to first
+        self.tilts = [
+            self.segments(columns, cubes),
+            self.segments(rows, cubes),
+            self.segments([line[::-1] for line in columns], cubes),
+            self.segments([line[::-1] for line in rows], cubes),
+        ]
+        self.row_masks = [
+            sum(1 << self.bit(x, y) for x in range(self.width))
+            for y in range(self.height)
+        ]
+
+    def bit(self, x, y):
+        return x * self.height + y
+
+    def segments(self, lines, cubes):
+        """
+        (mask, cell bits in rolling order, fills by rock count) per segment.
+        """
+        segments = []
+        for line in lines:
+            for is_cube, cells in groupby(line, lambda cell: cell in cubes):
+                if not is_cube:
+                    bits = [1 << self.bit(*cell) for cell in cells]
+                    segments.append((sum(bits), bits, {0: 0}))
+        return segments
+
+    def tilt(self, rocks, segments):
+        tilted = 0
+        for mask, bits, fills in segments:
+            count = (rocks & mask).bit_count()
+            fill = fills.get(count)
+            if fill is None:
+                fill = fills[count] = sum(bits[:count])
+            tilted |= fill
+        return tilted
+
+    def cycle(self, rocks):
+        for segments in self.tilts:
+            rocks = self.tilt(rocks, segments)
+        return rocks
+
+    def load(self, rocks):
+        return sum(
+            (rocks & mask).bit_count() * (self.height - y)
+            for y, mask in enumerate(self.row_masks)
+        )
+
+    def spin(self, cycles):
+        """
+        Load after cycles spin cycles, the first cycle that repeats later, and
+        the repeat's length.
+        """
+        rocks = self.rocks
+        seen = {rocks: 0}
+        history = [rocks]
+        for i in range(1, cycles + 1):
+            rocks = self.cycle(rocks)
+            if rocks in seen:
+                start = seen[rocks]
+                length = i - start
+                final = history[start + (cycles - start) % length]
+                return self.load(final), start, length
+            seen[rocks] = i
+            history.append(rocks)
+        return self.load(rocks), None, None
+
+
+platform = Platform(example)
+assert platform.load(platform.tilt(platform.rocks, platform.tilts[0])) == 136
+assert platform.spin(cycles)[0] == 64
+
+begin = time.time_ns()
+platform = Platform(aocd.data.splitlines())
+print("Part 1 bitmask", platform.load(platform.tilt(platform.rocks, platform.tilts[0])))
+load, start, length = platform.spin(cycles)
+end = time.time_ns()
+if start is None:
+    # no repeat, so every cycle was spun
+    print(f"Part 2 bitmask {load}: no cycle")
+    spins = cycles
+else:
+    print(f"Part 2 bitmask {load}: cycle of {length} from {start}")
+    spins = start + length
+per_cycle = (end - begin) / spins
+print(
+    f"{(end-begin)/1e6:.02f}ms, {per_cycle/1e3:.01f}µs per spin cycle;",
+    f"{cycles} of them would take {per_cycle * cycles / 1e9 / 3600:.01f}h",
+)
@@ -2,7 +2,11 @@
 
 import aocd
 from collections import defaultdict
+import os
+import random
 import re
+import string
+import time
 
 """
 So, to find the result of running the HASH algorithm on the string HASH:
@@ -111,3 +115,78 @@ print(s)
 boxes2 = part2(initialization_sequence)
 s2 = score(boxes2)
 print("Part 2", s2)
+
+
+## Table-driven HASHMAP
+
+# STEP[value << 8 | byte] is one round of HASH, so hashing a label is a lookup
+# per byte, and each label is hashed once, when first seen. Boxes are dicts,
+# which keep lenses in the order they were put in.
+
+STEP = bytes(((value + byte) * 17) % 256 for value in range(256) for byte in range(256))
+
+
+def hash_bytes(label: bytes):
+    value = 0
+    for byte in label:
+        value = STEP[value << 8 | byte]
+    return value
+
+
+def hashmap(data: bytes):
+    """
+    Run the whole initialization sequence; return the 256 boxes.
+    """
+    boxes: list[dict[bytes, int]] = [{} for _ in range(256)]
+    box_of: dict[bytes, dict[bytes, int]] = {}
+    for step in data.strip().split(b","):
+        label, equals, focal = step.partition(b"=")
+        if not equals:
+            label = label[:-1]  # label-
+        box = box_of.get(label)
+        if box is None:
+            box = box_of[label] = boxes[hash_bytes(label)]
+        if equals:
+            box[label] = int(focal)
+        else:
+            box.pop(label, None)
+    return boxes
+
+
+def focusing_power(boxes: list[dict[bytes, int]]):
+    return sum(
+        box_number * slot * focal
+        for box_number, box in enumerate(boxes, start=1)
+        for slot, focal in enumerate(box.values(), start=1)
+    )
+
+
+assert hash_bytes(b"HASH") == 52
+assert focusing_power(hashmap(",".join(example).encode())) == 145
+assert focusing_power(hashmap(aocd.data.encode())) == s2
+
+
+def benchmark(steps=10_000_000):
+    """
+    Time hashmap() on a long random sequence of steps.
+    """
+    random.seed(15)
+    labels = [
+        "".join(random.choices(string.ascii_lowercase, k=random.randint(2, 6)))
+        for _ in range(4000)
+    ]
+    synthetic = ",".join(
+        f"{label}-" if digit == "0" else f"{label}={digit}"
+        for label, digit in zip(
+            random.choices(labels, k=steps), random.choices("0123456789", k=steps)
+        )
+    ).encode()
+    begin = time.time_ns()
+    power = focusing_power(hashmap(synthetic))
+    end = time.time_ns()
+    print(f"{steps} steps, focusing power {power}, in {(end-begin)/1e9:.02f}s")
+
+
+# builds a ~100MB string; opt in with AOC_BENCH=1
+if os.environ.get("AOC_BENCH"):
+    benchmark()
@@ -145,3 +145,154 @@ for position, direction in edges(data):
     max_score = max(max_score, len(visited))
 
 print("Maximum", max_score)
+
+
+## Segment engine
+
+# A beam runs straight through mirrors and along splitters until it hits a
+# splitter side-on, which always sends out the same two beams whichever side
+# it was hit from. Each run is a segment, remembered as a bitset of the cells
+# it energises and the splitter it ends at. Splitters that reach each other
+# form strongly connected components that energise the same cells, so each
+# component's bitset is found once, successors first.
+
+# x, y steps for E, S, W, N
+STEPS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+EAST, SOUTH, WEST, NORTH = range(4)
+BOUNCE = {
+    "/": (NORTH, WEST, SOUTH, EAST),
+    "\\": (SOUTH, EAST, NORTH, WEST),
+}
+SPLIT = {"|": (NORTH, SOUTH), "-": (EAST, WEST)}
+
+
+class BeamTracer:
+    def __init__(self, lines: list[str]):
+        self.width, self.height = len(lines[0]), len(lines)
+        self.tiles = "".join(lines)
+        self.segments: dict[tuple[int, int], tuple[int, int]] = {}
+        self.splitters = [cell for cell, tile in enumerate(self.tiles) if tile in SPLIT]
+        self.energy = self.condense()
+
+    def segment(self, cell: int, direction: int):
+        """
+        (bitset, splitter cell or -1) for a beam entering cell in direction.
+        """
+        key = (cell, direction)
+        if key in self.segments:
+            return self.segments[key]
+
+        width, height, tiles = self.width, self.height, self.tiles
+        x, y = cell % width, cell // width
+        bits = 0
+        end = -1
+        seen = set()
+        while 0 <= x < width and 0 <= y < height:
+            cell = y * width + x
+            if (cell, direction) in seen:
+                break  # a loop of mirrors
+            seen.add((cell, direction))
+            bits |= 1 << cell
+            tile = tiles[cell]
+            if tile in BOUNCE:
+                direction = BOUNCE[tile][direction]
+            elif tile in SPLIT and direction not in SPLIT[tile]:
+                end = cell
+                break
+            dx, dy = STEPS[direction]
+            x, y = x + dx, y + dy
+
+        self.segments[key] = bits, end
+        return bits, end
+
+    def beams(self, splitter: int):
+        """
+        Segments leaving splitter, one per side.
+        """
+        x, y = splitter % self.width, splitter // self.width
+        for direction in SPLIT[self.tiles[splitter]]:
+            dx, dy = STEPS[direction]
+            if 0 <= x + dx < self.width and 0 <= y + dy < self.height:
+                yield self.segment((y + dy) * self.width + x + dx, direction)
+
+    def condense(self):
+        """
+        Tarjan's algorithm without recursion. Components come out successors
+        first, so each one's energy can include its successors' right away.
+        """
+        successors = {
+            splitter: [(bits, end) for bits, end in self.beams(splitter)]
+            for splitter in self.splitters
+        }
+        index: dict[int, int] = {}
+        low: dict[int, int] = {}
+        stack: list[int] = []
+        on_stack: set[int] = set()
+        energy: dict[int, int] = {}
+
+        for root in self.splitters:
+            if root in index:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, i = work.pop()
+                if i == 0:
+                    index[node] = low[node] = len(index)
+                    stack.append(node)
+                    on_stack.add(node)
+                nexts = successors[node]
+                if i < len(nexts):
+                    work.append((node, i + 1))
+                    end = nexts[i][1]
+                    if end < 0:
+                        continue
+                    if end not in index:
+                        work.append((end, 0))
+                    elif end in on_stack:
+                        low[node] = min(low[node], index[end])
+                    continue
+
+                # all successors done
+                for _, end in nexts:
+                    if end >= 0 and end in on_stack:
+                        low[node] = min(low[node], low[end])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    bits = 0
+                    for member in component:
+                        bits |= 1 << member
+                        for segment, end in successors[member]:
+                            # 0 for members, which aren't done yet
+                            bits |= segment | energy.get(end, 0)
+                    for member in component:
+                        energy[member] = bits
+
+        return energy
+
+    def energized(self, x: int, y: int, direction: int):
+        bits, end = self.segment(y * self.width + x, direction)
+        if end >= 0:
+            bits |= self.energy[end]
+        return bits.bit_count()
+
+    def edge_starts(self):
+        for x in range(self.width):
+            yield x, 0, SOUTH
+            yield x, self.height - 1, NORTH
+        for y in range(self.height):
+            yield 0, y, EAST
+            yield self.width - 1, y, WEST
+
+
+begin = time.time_ns()
+tracer = BeamTracer(data)
+part1 = tracer.energized(0, 0, EAST)
+part2 = max(tracer.energized(*start) for start in tracer.edge_starts())
+end = time.time_ns()
+print(f"Part 1 {part1} Part 2 {part2} in {(end-begin)/1e6:.02f}ms")
@@ -1,5 +1,9 @@
 #!/usr/bin/env python
 
+import heapq
+import time
+import tracemalloc
+
 import networkx as nx
 from networkx.algorithms import shortest_path_length
 
@@ -102,9 +106,18 @@ MAX_TRAVEL = 10
 MIN_TRAVEL = 4
 
 
+HORIZONTAL = 0
+VERTICAL = 1
+
+
 class Board:
     def __init__(self, data):
         self.data = data
+        self.width = max(x for x, y in data) + 1
+        self.height = max(y for x, y in data) + 1
+        self.costs = [
+            data[V(x, y)] for y in range(self.height) for x in range(self.width)
+        ]
 
     def edges(self, coord, direction, part2=True):
         index = cardinals.index(direction)
@@ -122,6 +135,113 @@ class Board:
                 yield (here, left), cost
                 yield (here, right), cost
 
+    def pack(self, coord, axis):
+        x, y = coord
+        return (y * self.width + x) * 2 + axis
+
+    def packed_edges(self, state, part2=True):
+        """
+        edges() for a packed (x, y, axis) state. Travel either way along the
+        axis, then turn onto the other axis; left and right turns are the same
+        state.
+        """
+        cell, axis = divmod(state, 2)
+        y, x = divmod(cell, self.width)
+        turned = 1 - axis
+        costs = self.costs
+        minimum = MIN_TRAVEL - 1 if part2 else 0
+
+        if axis == HORIZONTAL:
+            runs = ((1, self.width - 1 - x), (-1, x))
+        else:
+            runs = ((self.width, self.height - 1 - y), (-self.width, y))
+
+        for step, room in runs:
+            here = cell
+            cost = 0
+            for i in range(min(MAX_TRAVEL, room)):
+                here += step
+                cost += costs[here]
+                if i < minimum:
+                    continue
+                yield here * 2 + turned, cost
+
+
+def lazy_search(board: Board, sources, goals, part2=True):
+    """
+    Dijkstra over packed states, generating edges as they are reached. All
+    sources start at 0; return the cost of the first goal reached.
+    """
+    goals = set(goals)
+    distances = {s: 0 for s in sources}
+    unvisited = [(0, s) for s in sources]
+    heapq.heapify(unvisited)
+    visited = set()
+    while unvisited:
+        distance, state = heapq.heappop(unvisited)
+        if state in visited:
+            continue
+        if state in goals:
+            return distance
+        visited.add(state)
+        for next, cost in board.packed_edges(state, part2):
+            candidate = distance + cost
+            if candidate < distances.get(next, candidate + 1):
+                distances[next] = candidate
+                heapq.heappush(unvisited, (candidate, next))
+
+
+def networkx_search(board: Board, sources, goals, part2=True):
+    """
+    Build the whole (coord, direction) graph up front, then search every
+    start/goal combination.
+    """
+    dg = nx.DiGraph()
+
+    for coord in board.data:
+        for direction in cardinals:
+            dg.add_node((coord, direction))
+
+    for coord in board.data:
+        for direction in cardinals:
+            new_edges = [
+                ((coord, direction), n, weight)
+                for n, weight in board.edges(coord, direction, part2=part2)
+            ]
+            dg.add_weighted_edges_from(new_edges)
+
+    lengths = []
+    for s in sources:
+        for g in goals:
+            lengths.append(
+                shortest_path_length(dg, source=s, target=g, weight="weight")
+            )
+            print(f"{s}->{g}", lengths[-1])
+
+    return min(lengths)
+
+
+def measure(search, *args, trace=False):
+    """
+    Return search(*args), printing wall time. With trace, run it again under
+    tracemalloc for peak memory; tracing slows everything down, so the timed
+    run is kept separate.
+    """
+    begin = time.perf_counter()
+    result = search(*args)
+    elapsed = time.perf_counter() - begin
+    report = f"{search.__name__}: {result} in {elapsed:.02f}s"
+
+    if trace:
+        tracemalloc.start()
+        search(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        report += f", peak {peak / 2**20:.1f}MiB"
+
+    print(report)
+    return result
+
 
 b = Board(board)
 
@@ -130,33 +250,23 @@ for c in cardinals:
     # 1-indexed
     print(list(b.edges(V(0, 0), c)))
 
-dg = nx.DiGraph()
-
-for coord in b.data:
-    for direction in cardinals:
-        dg.add_node((coord, direction))
-
-for coord in b.data:
-    for direction in cardinals:
-        new_edges = [
-            ((coord, direction), n, weight)
-            for n, weight in b.edges(coord, direction, part2=True)
-        ]
-        dg.add_weighted_edges_from(new_edges)
+max_x = max(x for x, y in board)
+max_y = max(y for x, y in board)
 
 start = (V(0, 0), E)
 alt_start = (V(0, 0), S)
-
-max_x = max(x for x, y in board)
-max_y = max(y for x, y in board)
 goal = (V(max_x, max_y), S)
 alt_goal = (V(max_x, max_y), E)
 
-lengths = []
-for s in (start, alt_start):
-    for g in (goal, alt_goal):
-        lengths.append(shortest_path_length(dg, source=s, target=g, weight="weight"))
-        print(f"{s}->{g}", lengths[-1])
+lazy = measure(
+    lazy_search,
+    b,
+    [b.pack(V(0, 0), axis) for axis in (HORIZONTAL, VERTICAL)],
+    [b.pack(V(max_x, max_y), axis) for axis in (HORIZONTAL, VERTICAL)],
+    trace=True,
+)
+graph = measure(networkx_search, b, (start, alt_start), (goal, alt_goal), trace=True)
+assert lazy == graph
 
 
 def show(graph):
@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 
 import aocd
+import math
+from array import array
 from rich.console import Console
 
 print = Console().print
@@ -171,6 +173,150 @@ tryme(
 )
 
 
+## Compiled network
+
+# Modules are numbered and every connection is an edge number. A pulse is the
+# int edge * 2 + high, kept in a preallocated ring buffer. Flip-flops share one
+# int bitset, and each conjunction has an int of its inputs that were last high,
+# one bit per incoming edge.
+
+BROADCAST, FLIP_FLOP, CONJUNCTION = 0, 1, 2
+
+
+class Network:
+    def __init__(self, system: dict[str, Node], capacity=1 << 12):
+        self.names = list(system)
+        number = {name: i for i, name in enumerate(self.names)}
+        self.kinds = bytes(
+            {"%": FLIP_FLOP, "&": CONJUNCTION}.get(system[name].kind, BROADCAST)
+            for name in self.names
+        )
+
+        # edge 0 is the button
+        self.edge_source = [-1]
+        self.edge_dest = [number["broadcaster"]]
+        self.edge_bit = [0]
+        self.full = [0] * len(self.names)
+        self.out_edges = [[] for _ in self.names]
+        for name in self.names:
+            source = number[name]
+            for output in system[name].outputs:
+                dest = number[output]
+                self.out_edges[source].append(len(self.edge_dest))
+                self.edge_source.append(source)
+                self.edge_dest.append(dest)
+                self.edge_bit.append(self.full[dest] + 1)
+                self.full[dest] = self.full[dest] * 2 + 1
+        self.out_edges = [tuple(edges) for edges in self.out_edges]
+
+        self.capacity = capacity
+        self.queue = array("l", bytes(8 * capacity))
+        self.reset()
+
+    def reset(self):
+        self.flip_flops = 0
+        self.memory = [0] * len(self.names)
+        self.presses = 0
+
+    def press(self, watch=frozenset()):
+        """
+        Push the button once. Return the low and high pulses sent, and the
+        edges in watch that carried a high pulse.
+        """
+        queue, mask = self.queue, self.capacity - 1
+        kinds, memory, full = self.kinds, self.memory, self.full
+        edge_dest, edge_bit, out_edges = self.edge_dest, self.edge_bit, self.out_edges
+        flip_flops = self.flip_flops
+        counts = [0, 0]
+        fired = []
+
+        queue[0] = 0
+        head, tail = 0, 1
+        while head != tail:
+            pulse = queue[head & mask]
+            head += 1
+            edge, high = pulse >> 1, pulse & 1
+            counts[high] += 1
+            if high and edge in watch:
+                fired.append(edge)
+
+            dest = edge_dest[edge]
+            kind = kinds[dest]
+            if kind == FLIP_FLOP:
+                if high:
+                    continue
+                flip_flops ^= 1 << dest
+                high = (flip_flops >> dest) & 1
+            elif kind == CONJUNCTION:
+                if high:
+                    memory[dest] |= edge_bit[edge]
+                else:
+                    memory[dest] &= ~edge_bit[edge]
+                high = int(memory[dest] != full[dest])
+
+            for out in out_edges[dest]:
+                queue[tail & mask] = out * 2 + high
+                tail += 1
+            assert tail - head <= mask, "ring buffer overflow"
+
+        self.flip_flops = flip_flops
+        self.presses += 1
+        return counts[0], counts[1], fired
+
+    def pulse_product(self, presses=1000):
+        low = high = 0
+        for _ in range(presses):
+            pressed = self.press()
+            low += pressed[0]
+            high += pressed[1]
+        return low * high
+
+    def feeder_periods(self, target="rx", limit=1 << 16):
+        """
+        target's only input is a conjunction, so it sees a low pulse when every
+        input to that conjunction has just sent a high one. Press until each
+        feeder edge has fired twice, on a cycle that starts at zero.
+        """
+        (parent,) = (
+            self.names[self.edge_source[e]]
+            for e in range(1, len(self.edge_dest))
+            if self.names[self.edge_dest[e]] == target
+        )
+        assert self.kinds[self.names.index(parent)] == CONJUNCTION
+        feeders = {
+            e: self.names[self.edge_source[e]]
+            for e in range(1, len(self.edge_dest))
+            if self.names[self.edge_dest[e]] == parent
+        }
+        fires: dict[int, list[int]] = {e: [] for e in feeders}
+        self.reset()
+        while any(len(presses) < 2 for presses in fires.values()):
+            if self.presses >= limit:
+                raise ValueError(f"No period within {limit} presses")
+            for edge in self.press(watch=feeders)[2]:
+                fires[edge].append(self.presses)
+
+        periods = {}
+        for edge, (first, second, *_) in fires.items():
+            if second - first != first:
+                raise ValueError(f"{feeders[edge]} fires at {first}, {second}")
+            periods[feeders[edge]] = first
+        return periods
+
+
+network = Network(parse(example))
+assert network.pulse_product() == 32000000
+network = Network(
+    parse(
+        """broadcaster -> a
+%a -> inv, con
+&inv -> b
+%b -> con
+&con -> output""".splitlines()
+    )
+)
+assert network.pulse_product() == 11687500
+
 # aocd.submit(tryme(aocd.data.splitlines()), part=1)
 
 # aocd.submit(p2(aocd.data.splitlines(), True), part=2)
@@ -184,6 +330,7 @@ with open("dot.txt", "w") as out:
     out.write("}\n")
 
 
+import time
 import timeit
 
 k100 = timeit.timeit(lambda: simulate(system, 100001), number=1)
@@ -193,3 +340,11 @@ print(
     (215252378794009 / 100000) * k100 / 3600 / 24 / 365,
     "years",
 )
+
+network = Network(system)
+begin = time.time_ns()
+print("Part 1", network.pulse_product())
+periods = network.feeder_periods()
+print("Part 2", math.lcm(*periods.values()), periods)
+end = time.time_ns()
+print(f"in {(end-begin)/1e6:.02f}ms")
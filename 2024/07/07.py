@@ -2,6 +2,7 @@
 
 import aocd
 import re
+import time
 
 example = """\
 190: 10 19
@@ -42,3 +43,64 @@ print(answer)
 
 answer2 = sum(combine(aocd.data, True))
 print(answer2)
+
+
+## Right-to-left solver
+
+# Undo the last operator first. The target minus the last number, the target
+# divided exactly by it, or (part 2) the target with the last number's digits
+# stripped off the end must be reachable with the numbers before it.
+
+
+def shift(number):
+    """
+    The power of ten that concatenating number multiplies by.
+    """
+    power = 10
+    while power <= number:
+        power *= 10
+    return power
+
+
+def solvable(target, numbers, part2=False):
+    powers = [shift(number) for number in numbers] if part2 else None
+    stack = [(target, len(numbers) - 1)]
+    while stack:
+        value, i = stack.pop()
+        last = numbers[i]
+        if i == 0:
+            if value == last:
+                return True
+            continue
+        if value >= last:
+            stack.append((value - last, i - 1))
+        if last and value % last == 0:
+            stack.append((value // last, i - 1))
+        if part2 and value % powers[i] == last:
+            stack.append((value // powers[i], i - 1))
+    return False
+
+
+def solve_batch(equations, part2=False):
+    """
+    Whether each [target, *numbers] equation can be made true.
+    """
+    return [solvable(target, numbers, part2) for target, *numbers in equations]
+
+
+def calibrate(data: str, part2=False):
+    equations = list(parse(data))
+    return sum(
+        equation[0]
+        for equation, ok in zip(equations, solve_batch(equations, part2))
+        if ok
+    )
+
+
+assert calibrate(example) == 3749
+assert calibrate(example, True) == 11387
+
+begin = time.time_ns()
+print(calibrate(aocd.data), calibrate(aocd.data, True), end=" ")
+end = time.time_ns()
+print(f"right to left in {(end-begin)/1e6:.02f}ms")
@@ -1,9 +1,12 @@
 #!/usr/bin/env python
 
 import itertools
+import os
 from collections import defaultdict, deque
 
 import aocd
+import numpy as np
+import time
 
 FILLER = "\uff03"
 PRETTY = {
@@ -212,3 +215,110 @@ part2 = more_antinodes(board, group_by_frequency(board))
 display(board, part2)
 
 print(len(part2))
+
+
+## NumPy engine
+
+# Antennas are grouped once into (x, y) arrays per frequency. For every pair,
+# the positions t along the line a + t * step that stay on the board come from
+# dividing each bound by the step, so only on-board antinodes are generated.
+
+
+def antenna_arrays(data: str, ignore=".#"):
+    """
+    0-indexed (x, y) arrays of antennas by frequency, and the board size.
+    """
+    lines = data.split()
+    board = np.frombuffer("".join(lines).encode(), dtype=np.uint8)
+    board = board.reshape(len(lines), len(lines[0]))
+    antenna = ~np.isin(board, np.frombuffer(ignore.encode(), dtype=np.uint8))
+    ys, xs = np.nonzero(antenna)
+    chars = board[ys, xs]
+    arrays = {
+        chr(f): np.column_stack((xs[chars == f], ys[chars == f])).astype(np.int64)
+        for f in np.unique(chars)
+    }
+    return arrays, (board.shape[1], board.shape[0])
+
+
+def step_range(start, step, size):
+    """
+    Lowest and highest t with 0 <= start + t * step < size, elementwise.
+    Unbounded where step is 0.
+    """
+    far = np.int64(1 << 40)
+    divisor = np.where(step == 0, 1, step)
+    low_edge = np.where(step > 0, -start, size - 1 - start)
+    high_edge = np.where(step > 0, size - 1 - start, -start)
+    lowest = np.where(step == 0, -far, -(-low_edge // divisor))
+    highest = np.where(step == 0, far, high_edge // divisor)
+    return lowest, highest
+
+
+def antinode_grid(data: str, harmonics=False):
+    """
+    Boolean (height, width) grid of antinodes. With harmonics, every grid
+    position in line with two antennas of the same frequency.
+    """
+    arrays, (width, height) = antenna_arrays(data)
+    grid = np.zeros((height, width), dtype=bool)
+    for antennas in arrays.values():
+        first, second = np.triu_indices(len(antennas), 1)
+        a, b = antennas[first], antennas[second]
+        delta = b - a
+
+        if not harmonics:
+            for point in (a - delta, b + delta):
+                on_board = (
+                    (0 <= point[:, 0])
+                    & (point[:, 0] < width)
+                    & (0 <= point[:, 1])
+                    & (point[:, 1] < height)
+                )
+                grid[point[on_board, 1], point[on_board, 0]] = True
+            continue
+
+        step = delta // np.gcd(delta[:, 0], delta[:, 1])[:, None]
+        x_low, x_high = step_range(a[:, 0], step[:, 0], width)
+        y_low, y_high = step_range(a[:, 1], step[:, 1], height)
+        low = np.maximum(x_low, y_low)
+        counts = np.maximum(np.minimum(x_high, y_high) - low + 1, 0)
+
+        # t for every antinode of every pair, in one flat array
+        pair = np.repeat(np.arange(len(a)), counts)
+        offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        t = (low[pair] + offset)[:, None]
+        points = a[pair] + t * step[pair]
+        grid[points[:, 1], points[:, 0]] = True
+
+    return grid
+
+
+assert antinode_grid(example).sum() == 14
+assert antinode_grid(example, harmonics=True).sum() == 34
+assert antinode_grid(exampleT, harmonics=True).sum() == 9
+
+begin = time.time_ns()
+print(
+    "Parts 1 and 2",
+    antinode_grid(aocd.data).sum(),
+    antinode_grid(aocd.data, harmonics=True).sum(),
+    end=" ",
+)
+end = time.time_ns()
+print(f"in {(end-begin)/1e6:.02f}ms")
+
+# a 5000x5000 board of random antennas; set AOC_BENCH=1 for it
+if os.environ.get("AOC_BENCH"):
+    rng = np.random.default_rng(8)
+    size = 5000
+    frequencies = [c for c in range(ord("0"), ord("{")) if chr(c).isalnum()]
+    synthetic = np.full((size, size + 1), ord("."), dtype=np.uint8)
+    synthetic[:, -1] = ord("\n")
+    cells = rng.choice(size * size, len(frequencies) * 4, replace=False)
+    synthetic[cells // size, cells % size] = np.repeat(frequencies, 4)
+    synthetic = synthetic.tobytes().decode()
+    begin = time.time_ns()
+    grid = antinode_grid(synthetic, harmonics=True)
+    end = time.time_ns()
+    print(f"{size}x{size}: {grid.sum()} antinodes in {(end-begin)/1e6:.02f}ms")
@@ -1,166 +1,85 @@
 #!/usr/bin/env python
 
-import heapq
+import pathlib
 import sys
-import time
-from dataclasses import dataclass
 from typing import Iterable
 
 import aocd
 
+# add flatgrid to path
+sys.path.append(str(pathlib.Path(__file__).parents[2]))
 
-def height(letter):
-    return int(letter)
-
+import flatgrid
 
-@dataclass(order=True)
-class Node:
-    distance: int = sys.maxsize
-    coord: tuple = (0, 0)
-    height: int = 0
-    visited: bool = False
-    letter: str = ""
-
-    def __hash__(self):
-        return hash(self.coord)
-
-    def reset(self):
-        self.visited = False
-        self.distance = sys.maxsize
 
+def height(letter):
+    return int(letter)
 
-@dataclass
-class Grid:
-    nodes: set[Node]
-    array: list[list[Node]]
-    start: Node
-    end: Node
-    prev: Node | None = None
 
+class Grid(flatgrid.Grid):
     def __init__(self, rows):
-        self.nodes = set()
-        self.array = []
-
-        def build(letter="", **args):
-            node = Node(**args, letter=letter)
-            if letter == "0":
-                self.start = node
-            elif letter == "9":
-                self.end = node
-            self.nodes.add(node)
-            return node
-
-        self.array = [
-            [
-                build(coord=(x, y), height=height(c), letter=c)
-                for (x, c) in enumerate(row)
-            ]
-            for (y, row) in enumerate(rows)
-        ]
-
-        self.start.distance = 0
-
-    def neighbors(self, node: Node):
-        """
-        All neighbors for node.
-        """
-        x, y = node.coord
-        for dx, dy in (-1, 0), (1, 0), (0, -1), (0, 1):
-            nx, ny = x + dx, y + dy
-            if nx < 0 or ny < 0:
-                continue
-            try:
-                yield self.array[y + dy][x + dx]
-            except IndexError:
-                pass
+        super().__init__(rows)
+        self.heights = bytes(height(chr(c)) for c in self.letters)
+        self.start = self.find("0")
+        self.end = self.find("9")
 
     # Rule is "can only go up exactly one level"
-    def incoming(self, node: Node):
+    def incoming(self, node: int):
         """
         All nodes that can reach this node.
         """
-        incoming_height = node.height - 1
+        incoming_height = self.heights[node] - 1
         for n in self.neighbors(node):
-            if n.height == incoming_height:
-                yield n
+            if self.heights[n] == incoming_height:
+                yield n, 1
 
-    def outgoing(self, node: Node):
+    def outgoing(self, node: int):
         """
         All nodes that can be reached by this node.
         """
-        outgoing_height = node.height + 1
+        outgoing_height = self.heights[node] + 1
         for n in self.neighbors(node):
-            if n.height == outgoing_height:
-                yield n
+            if self.heights[n] == outgoing_height:
+                yield n, 1
 
     def display(
         self,
         pending,
         pathset0: Iterable[tuple[int, int]] = (),
-        pathset: Iterable[Node] = (),
+        pathset: Iterable[int] = (),
     ):
         pathset0 = set(pathset0)
         pathset = set(pathset)
         pending = set(pending)
         print("\N{MOUNTAIN}")
-        for row in self.array:
-            for col in row:
+        for y in range(self.height):
+            for x in range(self.width):
+                col = self.index(x, y)
                 if col == self.end:
                     char = "\N{SNOWMAN}"
                 elif col == self.start:
                     char = "\N{WORLD MAP}"
-                elif col.coord in pathset0:
+                elif (x, y) in pathset0:
                     char = "\N{CANDLE}"
                 elif col in pathset:
                     char = "\N{SLEUTH OR SPY}"
                 elif col in pending:
                     char = "+"
-                elif col.visited:
+                elif self.visited(col):
                     # print(" ", end="")
-                    char = chr(ord("0") + col.distance % 10)
+                    char = chr(ord("0") + self.distance(col) % 10)
                 else:
-                    char = col.letter
+                    char = self.letter(col)
                 print(char, end="")
             print()
 
-    def shortest(self, start, goal, connected, show=False):
-        # nodes.visited and nodes.distance should be reset before calling
-        display_distance = 0
-        unvisited = [(start.distance, start)]
-        while unvisited:
-            original_priority, node = heapq.heappop(unvisited)
-            if original_priority != node.distance:
-                continue
-            if node.visited:
-                continue
-            if display_distance < node.distance:
-                display_distance = node.distance
-                if show:
-                    print("\033[2J\033[H")  # clear screen and move to home
-                    self.display(n for _, n in unvisited)
-                    sys.stdout.flush()
-
-                    time.sleep(0.01)
-            node.visited = True
-            # if node == goal:
-            #     break
-
-            for next in connected(node):
-                if not next.visited:
-                    next.distance = min(node.distance + 1, next.distance)
-                    heapq.heappush(unvisited, (next.distance, next))
-
-    def distinct_paths(self, start: Node, connected):
+    def distinct_paths(self, start: int, connected):
         """
         Distinct paths to "9" from start using 'connected' function to find neighbors.
         """
-        if start.letter == "9":
+        if self.letters[start] == ord("9"):
             return 1
-        return sum(self.distinct_paths(next, connected) for next in connected(start))
-
-    def reset(self):
-        for node in self.nodes:
-            node.reset()
+        return sum(self.distinct_paths(next, connected) for next, _ in connected(start))
 
 
 example = """\
@@ -178,26 +97,26 @@ example = """\
 def part1(data: list[str]):
     grid = Grid(data)
     grid.display(set())
-    print(grid.start, grid.end)
+    print(grid.coord(grid.start), grid.coord(grid.end))
 
-    assert grid.array[3][4].coord == (4, 3)
+    assert grid.coord(grid.index(4, 3)) == (4, 3)
 
-    grid.shortest(grid.start, grid.end, grid.outgoing)
+    grid.shortest(grid.start, grid.outgoing)
 
     grid.display(set())
 
+    summits = list(grid.find_all("9"))
     score = 0
     scores = []
-    for start in [n for n in grid.nodes if n.letter == "0"]:
+    for start in list(grid.find_all("0")):
         grid.reset()
-        start.distance = 0
         grid.start = start
-        grid.shortest(grid.start, grid.end, grid.outgoing)
-        score += sum(n.distance < sys.maxsize for n in grid.nodes if n.letter == "9")
+        grid.shortest(grid.start, grid.outgoing)
+        score += sum(grid.distance(n) < sys.maxsize for n in summits)
         scores.append(
             (
-                start.coord,
-                sum(n.distance < sys.maxsize for n in grid.nodes if n.letter == "9"),
+                grid.coord(start),
+                sum(grid.distance(n) < sys.maxsize for n in summits),
             )
         )
 
@@ -215,9 +134,7 @@ print("Part 1", part1(aocd.data.splitlines()))
 def part2(data: list[str]):
     gridx = Grid(data)
     total = 0
-    for start in sorted(
-        (n for n in gridx.nodes if n.letter == "0"), key=lambda n: n.coord
-    ):
+    for start in sorted(gridx.find_all("0"), key=gridx.coord):
         score = gridx.distinct_paths(start, gridx.outgoing)
         total += score
     return total
@@ -1,12 +1,16 @@
 #!/usr/bin/env python
 
-from collections import defaultdict
+from array import array
+from bisect import bisect_right
+from collections import defaultdict, namedtuple
 
 import aocd
 import functools
 import itertools
+import os
 import time
 import timeit
+import tracemalloc
 
 
 def parse(data):
@@ -90,3 +94,115 @@ print(f"75 non-recursive blinks in {(end-begin)/1e9:.02f}s")
 print("Dict method %0.4f" % timeit.timeit('blink_iterative(75)', number=100, globals=globals()))
 print("Memo method %0.4f" % timeit.timeit('blink_remains(parse(aocd.data), 75)', 'blink_remains.cache_clear()', number=100, globals=globals()))
 
+
+
+## Array-backed engine
+
+# Every stone value seen is numbered in order of discovery. left[i] and
+# right[i] are the numbers of the stones that stone i becomes (right is -1 if
+# it doesn't split), and each starting line is a list of counts by number.
+
+POWERS = [10**k for k in range(1, 40)]
+
+BlinkStats = namedtuple("BlinkStats", ["totals", "distinct", "peak_live"])
+
+
+def split(stone):
+    """
+    blink() with arithmetic instead of str(); returns (left, right or None).
+    """
+    if stone == 0:
+        return 1, None
+    digits = bisect_right(POWERS, stone) + 1
+    if digits % 2 == 0:
+        return divmod(stone, POWERS[digits // 2 - 1])
+    return stone * 2024, None
+
+
+class StoneTable:
+    def __init__(self):
+        self.values = []
+        self.numbers = {}
+        self.left = array("q")
+        self.right = array("q")
+
+    def number(self, stone):
+        i = self.numbers.get(stone)
+        if i is None:
+            i = self.numbers[stone] = len(self.values)
+            self.values.append(stone)
+        return i
+
+    def expand(self):
+        """
+        Find what each stone numbered since the last expand() becomes.
+        """
+        for i in range(len(self.left), len(self.values)):
+            left, right = split(self.values[i])
+            self.left.append(self.number(left))
+            self.right.append(-1 if right is None else self.number(right))
+
+
+def blink_batch(lines, turns):
+    """
+    Number of stones after turns blinks for each line of starting stones.
+    """
+    table = StoneTable()
+    rows = []
+    for line in lines:
+        counts = defaultdict(int)
+        for stone in line:
+            counts[table.number(stone)] += 1
+        rows.append(counts)
+    rows = [
+        [counts.get(i, 0) for i in range(len(table.values))] for counts in rows
+    ]
+    peak_live = 0
+
+    for turn in range(turns):
+        table.expand()
+        size = len(table.values)
+        left, right = table.left, table.right
+        for r, counts in enumerate(rows):
+            new = [0] * size
+            for i, count in enumerate(counts):
+                if count:
+                    new[left[i]] += count
+                    j = right[i]
+                    if j >= 0:
+                        new[j] += count
+            rows[r] = new
+            peak_live = max(peak_live, size - new.count(0))
+
+    return BlinkStats([sum(counts) for counts in rows], len(table.values), peak_live)
+
+
+assert all(
+    split(stone) == (*blink(stone), None)[:2] for stone in range(100000)
+), "split() disagrees with blink()"
+assert blink_batch([parse(example)], 1).totals == [7]
+assert blink_batch([parse("125 17")], 25).totals == [55312]
+
+# 500 blinks, and every run again under tracemalloc; opt in with AOC_BENCH=1
+if os.environ.get("AOC_BENCH"):
+    for turns in (25, 75, 500):
+        begin = time.time_ns()
+        stats = blink_batch([parse(aocd.data)], turns)
+        end = time.time_ns()
+        print(
+            f"{turns} array blinks in {(end-begin)/1e9:.02f}s:",
+            f"{stats.totals[0]:.4g} stones,",
+            f"{stats.distinct} distinct, at most {stats.peak_live} at once",
+        )
+        tracemalloc.start()
+        blink_batch([parse(aocd.data)], turns)
+        print(f"peak memory {tracemalloc.get_traced_memory()[1] / 2**20:.2f}MiB")
+        tracemalloc.stop()
+
+# each starting stone as its own line
+lines = [(stone,) for stone in parse(aocd.data)] + [parse(example)]
+begin = time.time_ns()
+stats = blink_batch(lines, 75)
+end = time.time_ns()
+assert sum(stats.totals[:-1]) == blink_iterative(75)
+print(f"{len(lines)} lines, 75 blinks in {(end-begin)/1e9:.02f}s", stats.totals)
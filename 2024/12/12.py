@@ -1,15 +1,17 @@
 #!/usr/bin/env python
 
-import heapq
 import pathlib
 import sys
-import time
-from dataclasses import dataclass
 from itertools import cycle
 
 import aocd
 import shapely
 
+# add flatgrid to path
+sys.path.append(str(pathlib.Path(__file__).parents[2]))
+
+import flatgrid
+
 DEBUG = False
 
 PRETTY = {}
@@ -20,65 +22,12 @@ def height(letter):
     return ord(letter) - ord("A")
 
 
-@dataclass(order=True)
-class Node:
-    distance: int = sys.maxsize
-    coord: tuple = (0, 0)
-    height: int = 0
-    visited: bool = False
-    letter: str = ""
-
-    def __hash__(self):
-        return hash(self.coord)
-
-    def reset(self):
-        self.visited = False
-        self.distance = sys.maxsize
-
-
-@dataclass
-class Grid:
-    nodes: set[Node]
-    array: list[list[Node]]
-    start: Node
-    end: Node
-    prev: Node | None = None
-
-    def __init__(self, rows):
-        self.nodes = set()
-        self.array = []
-
-        def build(letter="", **args):
-            node = Node(**args, letter=letter)
-            self.nodes.add(node)
-            return node
-
-        self.array = [
-            [
-                build(coord=(x, y), height=height(c), letter=c)
-                for (x, c) in enumerate(row)
-            ]
-            for (y, row) in enumerate(rows)
-        ]
-
-    def neighbors(self, node: Node):
-        """
-        All neighbors for node.
-        """
-        x, y = node.coord
-        for dx, dy in (-1, 0), (1, 0), (0, -1), (0, 1):
-            nx, ny = x + dx, y + dy
-            if nx < 0 or ny < 0:
-                continue
-            try:
-                yield self.array[y + dy][x + dx]
-            except IndexError:
-                pass
-
-    def same_letter(self, node: Node):
+class Grid(flatgrid.Grid):
+    def same_letter(self, node: int):
+        letters = self.letters
         for n in self.neighbors(node):
-            if n.letter == node.letter:
-                yield n
+            if letters[n] == letters[node]:
+                yield n, 1
 
     def display(
         self,
@@ -86,44 +35,16 @@ class Grid:
     ):
         highlight = set(highlight)
         print("\N{RED APPLE}")
-        for row in self.array:
-            for col in row:
+        for y in range(self.height):
+            for x in range(self.width):
+                col = self.index(x, y)
                 if col in highlight:
                     char = "\N{GLOWING STAR}"
                 else:
-                    char = col.letter
+                    char = self.letter(col)
                 print(PRETTY.get(char, char), end="")
             print()
 
-    def flood(self, start, connected, show=False):
-        display_distance = 0
-        unvisited = [(start.distance, start)]
-        while unvisited:
-            original_priority, node = heapq.heappop(unvisited)
-            if original_priority != node.distance:
-                continue
-            if node.visited:
-                continue
-            if display_distance < node.distance:
-                display_distance = node.distance
-                if show:
-                    print("\033[2J\033[H")  # clear screen and move to home
-                    self.display(n for _, n in unvisited)
-                    sys.stdout.flush()
-
-                    time.sleep(0.01)
-
-            node.visited = True
-
-            for next in connected(node):
-                if not next.visited:
-                    next.distance = min(node.distance + 1, next.distance)
-                    heapq.heappush(unvisited, (next.distance, next))
-
-    def reset(self):
-        for node in self.nodes:
-            node.reset()
-
 
 example = """\
 RRRRIICCFF
@@ -177,21 +98,17 @@ def count_sides(points, letter=None, number=None):
 
 def fence_costs(data: list[str], show=False):
     grid = Grid(data)
-    grid.end = next(n for n in grid.nodes)  # not needed for this puzzle
 
     all_regions = set()
     regions = []
     region_number = 0
-    for n in grid.nodes:
+    for n in range(grid.size):
         if n in all_regions:
             continue
 
-        grid.start = n
-        grid.start.distance = 0
-
-        grid.flood(grid.start, connected=grid.same_letter)
+        grid.shortest(n, connected=grid.same_letter)
 
-        regions.append({n for n in grid.nodes if n.visited})
+        regions.append(set(grid.reached()))
         all_regions.update(regions[-1])
 
         if show:
@@ -212,26 +129,27 @@ def fence_costs(data: list[str], show=False):
 
         polygons = []
         for node in region:
-            x, y = node.coord
+            x, y = grid.coord(node)
             polygon = shapely.Polygon(((x, y), (x + 1, y), (x + 1, y + 1), (x, y + 1)))
             polygons.append(polygon)
             perimeter += 4 - len(list(grid.same_letter(node)))
+        letter = grid.letter(node)
 
         polys = shapely.GeometryCollection(polygons)
         p2: shapely.Polygon = shapely.union_all(polys)  # type: ignore
 
         if DEBUG:
             print(
-                f"{i} {node.letter} Old score {area * perimeter:4d}",
+                f"{i} {letter} Old score {area * perimeter:4d}",
                 f"\ta={area} boundary coords={len(count_sides(p2.exterior.coords))}",
             )
 
-            pathlib.Path(f"{i}-{node.letter}.svg").write_text(p2._repr_svg_())
+            pathlib.Path(f"{i}-{letter}.svg").write_text(p2._repr_svg_())
 
         score += area * perimeter
-        score2 += len(count_sides(p2.exterior.coords, node.letter, i)) * area
+        score2 += len(count_sides(p2.exterior.coords, letter, i)) * area
         for interior in p2.interiors:
-            score2 += len(count_sides(interior.coords, node.letter, i)) * area
+            score2 += len(count_sides(interior.coords, letter, i)) * area
 
     return score, score2
 
@@ -3,6 +3,13 @@
 import aocd
 import re
 import functools
+import pathlib
+import sys
+
+# add parallel to path
+sys.path.append(str(pathlib.Path(__file__).parents[2]))
+
+from parallel import pmap
 
 DEBUG = False
 
@@ -141,19 +148,26 @@ for i, piece in enumerate(part2):
 print(results)
 
 
-def part2_method(offset, compare_with_part1=False):
+def solve_machine(item):
+    i, piece = item
     results = []
-    for i, piece in enumerate(list(parse_offset(aocd.data, offset=offset))):
-        # this is not enough information to allow us to guess_bisect once
-        # guesser = functools.partial(do_algebra, *piece)
-        # polarity = guesser(0) - guesser(1)
-
-        for g in (
-            guess_bisect(piece, True, index=i),
-            guess_bisect(piece, False, index=i),
-        ):
-            if g:
-                results.append((i, search_1(*piece, g)))
+    # this is not enough information to allow us to guess_bisect once
+    # guesser = functools.partial(do_algebra, *piece)
+    # polarity = guesser(0) - guesser(1)
+
+    for g in (
+        guess_bisect(piece, True, index=i),
+        guess_bisect(piece, False, index=i),
+    ):
+        if g:
+            results.append((i, search_1(*piece, g)))
+    return results
+
+
+def part2_method(offset, compare_with_part1=False):
+    machines = enumerate(list(parse_offset(aocd.data, offset=offset)))
+    per_machine, _ = pmap(solve_machine, machines)
+    results = [result for found in per_machine for result in found]
 
     tokens = 0
     for i, result in results:
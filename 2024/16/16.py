@@ -1,13 +1,18 @@
 #!/usr/bin/env python
 
-import heapq
+import os
+import pathlib
 import sys
 import time
-from dataclasses import dataclass
-from typing import Any, Generator, Iterable
+from typing import Iterable
 
 import aocd
 
+# add flatgrid to path
+sys.path.append(str(pathlib.Path(__file__).parents[2]))
+
+import flatgrid
+
 sys.setrecursionlimit(10000)
 
 PRETTY = {
@@ -38,173 +43,77 @@ example = """\
 HORIZONTAL = 0
 VERTICAL = 1
 
-
-@dataclass(order=True)
-class Node:
-    distance: int = sys.maxsize
-    coord: tuple = (0, 0, 0)
-    visited: bool = False
-    letter: str = ""
-
-    def __hash__(self):
-        return hash(self.coord)
-
-    def reset(self):
-        self.visited = False
-        self.distance = sys.maxsize
+OPEN = b".SE"
+TURN = 1000
 
 
-@dataclass
-class Grid:
-    nodes: dict[tuple, Node]
-    array: list[list[Node]]
-    start: Node
-    end: Node
-    prev: Node | None = None
-
+class Grid(flatgrid.Grid):
     def __init__(self, rows):
-        self.nodes = {}
-        self.array = []
-
-        def build(coord=(), letter="", **args):
-            horizontal = Node(coord=coord + (HORIZONTAL,), **args, letter=letter)
-            vertical = Node(coord=coord + (VERTICAL,), **args, letter=letter)
-            if letter != "#":
-                self.nodes[horizontal.coord] = horizontal
-                self.nodes[vertical.coord] = vertical
-            if letter == "S":
-                self.start = horizontal  # facing East
-            elif letter == "E":
-                self.end = horizontal  # or vertical
-            return horizontal
-
-        self.array = [
-            [build(coord=(x, y), letter=c) for (x, c) in enumerate(row)]
-            for (y, row) in enumerate(rows)
-        ]
-
-        self.start.distance = 0
-
-    def neighbors(self, node: Node):
-        """
-        All neighbors for node.
-        """
-        x, y, z = node.coord
-        for dx, dy, dz in (
-            (-1, 0, 0),
-            (1, 0, 0),
-            (0, -1, 0),
-            (0, 1, 0),
-            (0, 0, -1),
-            (0, 0, 1),
-        ):
-            nx, ny, nz = x + dx, y + dy, z + dz
-            if (nx, ny, nz) in self.nodes:
-                yield self.nodes[(nx, ny, nz)]
-
-    def outgoing(self, node: Node):
+        super().__init__(rows, layers=2)
+        self.start = self.find("S") + HORIZONTAL * self.size  # facing East
+        self.end = self.find("E") + HORIZONTAL * self.size  # or vertical
+        self.in_path = set()
+
+    def outgoing(self, node: int):
         """
         All nodes that can be reached by this node.
 
         Plus cost.
         """
-        # or a difference in X coordinates
-        horizontal = node.coord[-1] == HORIZONTAL
+        letters = self.letters
+        cell = self.cell(node)
+        layer = self.layer(node)
+        # one step along the current axis
+        step = 1 if layer == HORIZONTAL else self.width
         for n in self.neighbors(node):
-            if horizontal and n.coord[1] != node.coord[1]:
-                continue
-            if not horizontal and n.coord[0] != node.coord[0]:
-                continue
-
-            if n.letter in ".SE":
-                cost = 1 if n.coord[-1] == node.coord[-1] else 1000
-                if n.letter == "E" and node.letter == "E":
-                    cost = 0
-                yield n, cost
-
-    def outgoing_down_only(self, node: Node):
+            if abs(n - node) == step and letters[self.cell(n)] in OPEN:
+                yield n, 1
+
+        # or turn in place
+        turned = cell + (1 - layer) * self.size
+        yield turned, 0 if letters[cell] == ord("E") else TURN
+
+    def outgoing_down_only(self, node: int):
         for n, cost in self.outgoing(node):
-            if n.distance > node.distance:
+            if self.distance(n) > self.distance(node):
                 yield n
 
     def display(
         self,
         pending,
         pathset0: Iterable[tuple[int, int]] = (),
-        pathset: Iterable[Node] = (),
+        pathset: Iterable[int] = (),
     ):
-        pathset0 = set(pathset0)
-        pathset = set(pathset)
-        pending = set(pending)
         print("\N{MOUNTAIN}")
-        for row in self.array:
-            for col in row:
-                print(PRETTY.get(col.letter), end="")
+        for y in range(self.height):
+            for x in range(self.width):
+                print(PRETTY.get(self.letter(self.index(x, y))), end="")
             print()
 
-    def shortest(
-        self,
-        start,
-        goal,
-        connected: Generator[tuple[Node, int], Any, None],
-        show=False,
-    ):
-        # nodes.visited and nodes.distance should be reset before calling
-        display_distance = 0
-        unvisited = [(start.distance, start)]
-        while unvisited:
-            original_priority, node = heapq.heappop(unvisited)
-            if original_priority != node.distance:
-                continue
-            if node.visited:
-                continue
-            if display_distance < node.distance:
-                display_distance = node.distance
-                if show:
-                    print("\033[2J\033[H")  # clear screen and move to home
-                    self.display(n for _, n in unvisited)
-                    sys.stdout.flush()
-
-                    time.sleep(0.01)
-            node.visited = True
-
-            # Find distance for all
-            # if node == self.end:
-            #     break
-
-            for next, cost in connected(node):
-                if not next.visited:
-                    next.distance = min(node.distance + cost, next.distance)
-                    heapq.heappush(unvisited, (next.distance, next))
-
-    def distinct_paths(self, start: Node, connected):
+    def distinct_paths(self, start: int, connected):
         """
         Distinct paths to "9" from start using 'connected' function to find neighbors.
         """
-        if start.letter == "E":
+        if self.letters[self.cell(start)] == ord("E"):
             return 1
         paths = sum(self.distinct_paths(next, connected) for next in connected(start))
         if paths > 0:
-            start.in_path = True
+            self.in_path.add(start)
         return paths
 
-    def reset(self):
-        for node in self.nodes.values():
-            node.reset()
-
 
 def part1(data: list[str]):
     grid = Grid(data)
     grid.display(set())
-    print(grid.start, grid.end)
+    print(grid.coord(grid.start), grid.coord(grid.end))
 
-    grid.shortest(grid.start, grid.end, grid.outgoing)
+    grid.shortest_buckets(grid.start, grid.outgoing)
 
     grid.display(set())
 
-    print(grid.end.distance)
+    print(grid.distance(grid.end))
 
-    return grid.end.distance
+    return grid.distance(grid.end)
 
 
 print("Part 1", part1(example.splitlines()))
@@ -217,18 +126,45 @@ print("Part 1", part1(example.splitlines()))
 def part2(data):
     grid = Grid(data.splitlines())
     grid.display(set())
-    print(grid.start, grid.end)
+    print(grid.coord(grid.start), grid.coord(grid.end))
 
-    grid.shortest(grid.start, grid.end, grid.outgoing)
+    grid.shortest_buckets(grid.start, grid.outgoing)
 
     grid.display(set())
 
     print(grid.distinct_paths(grid.start, grid.outgoing_down_only))
 
-    return 1 + len(
-        set(n.coord[:2] for n in grid.nodes.values() if hasattr(n, "in_path"))
-    )
+    return 1 + len(set(grid.cell(n) for n in grid.in_path))
 
 
 print("Nodes in best paths (example)", part2(example))
 print("Nodes in best paths", part2(aocd.data))
+
+
+## Benchmark
+
+# Costs are only 0, 1 and 1000, so a bucket queue keyed on distance never
+# compares (distance, node) tuples.
+
+
+def benchmark(data, repeat=10):
+    grid = Grid(data.splitlines())
+    searches = {
+        "heapq": grid.shortest,
+        "buckets": grid.shortest_buckets,
+    }
+    for name, search in searches.items():
+        begin = time.time_ns()
+        for _ in range(repeat):
+            grid.reset()
+            search(grid.start, grid.outgoing)
+        end = time.time_ns()
+        print(
+            f"{name:8} {grid.distance(grid.end)}",
+            f"in {(end-begin)/1e6/repeat:.02f}ms per search",
+        )
+
+
+# twenty extra full searches; run with AOC_BENCH=1
+if os.environ.get("AOC_BENCH"):
+    benchmark(aocd.data)
@@ -1,8 +1,11 @@
 #!/usr/bin/env python
 
 import aocd
+import heapq
 import re
-from dataclasses import dataclass, replace
+import time
+from dataclasses import dataclass, field, replace
+from typing import ClassVar
 
 example = """\
 Register A: 729
@@ -14,6 +17,31 @@ Program: 0,1,5,4,3,0
 
 OUTPUT = []
 
+MNEMONICS = ["adv", "bxl", "bst", "jnz", "bxc", "out", "bdv", "cdv"]
+
+
+@dataclass
+class Trace:
+    """
+    Opcode counts, cycles per run() and (cycle, ns, value) for each output.
+    """
+
+    counts: list[int] = field(default_factory=lambda: [0] * len(MNEMONICS))
+    cycles: list[int] = field(default_factory=list)
+    outputs: list[tuple[int, int, int]] = field(default_factory=list)
+
+    def report(self):
+        total = sum(self.counts)
+        for op in sorted(range(len(self.counts)), key=lambda op: -self.counts[op]):
+            if self.counts[op]:
+                print(
+                    f"{MNEMONICS[op]} {self.counts[op]:>10} {self.counts[op]/total:6.1%}"
+                )
+        print(f"{len(self.cycles)} runs, {total} cycles, {len(self.outputs)} outputs")
+        if self.outputs:
+            cycle, ns, value = self.outputs[-1]
+            print(f"last output {value} at cycle {cycle}, {ns/1e3:.01f}µs into run")
+
 
 @dataclass
 class VM:
@@ -22,6 +50,10 @@ class VM:
     c: int = 0
     instructions: tuple[int, ...] = tuple()
     pc: int = 0
+    # run() records into this when set; None costs one check per run()
+    trace: Trace | None = field(default=None, repr=False, compare=False)
+
+    OPS: ClassVar[tuple]
 
     def combo(self, op):
         if op <= 3:
@@ -70,6 +102,41 @@ class VM:
 
         self.pc += 2
 
+    # one method per opcode for step_table(); true if the pc was set
+    def adv(self, operand):
+        self.a = self.a >> self.combo(operand)
+
+    def bxl(self, operand):
+        self.b = self.b ^ operand
+
+    def bst(self, operand):
+        self.b = self.combo(operand) & 7
+
+    def jnz(self, operand):
+        if self.a != 0:
+            self.pc = operand
+            return True
+
+    def bxc(self, operand):
+        self.b = self.b ^ self.c
+
+    def out(self, operand):
+        OUTPUT.append(self.combo(operand) & 7)
+
+    def bdv(self, operand):
+        self.b = self.a >> self.combo(operand)
+
+    def cdv(self, operand):
+        self.c = self.a >> self.combo(operand)
+
+    def step_table(self):
+        """
+        step() dispatched through OPS instead of the if/elif chain.
+        """
+        pc = self.pc
+        if not self.OPS[self.instructions[pc]](self, self.instructions[pc + 1]):
+            self.pc = pc + 2
+
     def dis(self):
         for instruction, op in zip(self.instructions[0::2], self.instructions[1::2]):
             if instruction in (0, 2, 5, 6, 7):
@@ -78,22 +145,126 @@ class VM:
                     op = "abc"[op - 4]
 
             print(
-                ["adv", "bxl", "bst", "jnz", "bxc", "out", "bdv", "cdv"][instruction],
+                MNEMONICS[instruction],
                 op,
             )
 
-    def run(self):
+    def run(self, table=False):
         OUTPUT.clear()
-        while self.pc < len(self.instructions):
-            self.step()
+        step = self.step_table if table else self.step
+        if self.trace is None:
+            while self.pc < len(self.instructions):
+                step()
+        else:
+            self.run_traced(step)
         return ",".join(str(o) for o in OUTPUT)
 
+    def run_traced(self, step):
+        trace = self.trace
+        begin = time.perf_counter_ns()
+        cycles = 0
+        while self.pc < len(self.instructions):
+            op = self.instructions[self.pc]
+            trace.counts[op] += 1
+            cycles += 1
+            step()
+            if op == 5:
+                trace.outputs.append(
+                    (cycles, time.perf_counter_ns() - begin, OUTPUT[-1])
+                )
+        trace.cycles.append(cycles)
+
+
+VM.OPS = tuple(getattr(VM, name) for name in MNEMONICS)
+
 
 def parse(data):
     a, b, c, *instructions = map(int, re.findall(r"\d+", data))
     return VM(a, b, c, tuple(instructions))
 
 
+def compile_program(instructions: tuple[int, ...]):
+    """
+    Translate instructions once into a Python function of (a, b, c) returning
+    the output as a tuple of ints. Each jump target becomes a block of
+    straight-line code; no VM objects and no global state.
+    """
+
+    def combo(op):
+        if op <= 3:
+            return str(op)
+        elif op in (4, 5, 6):
+            return "abc"[op - 4]
+        else:
+            raise NotImplementedError(f"combo op {op}")
+
+    def statement(pc):
+        op, operand = instructions[pc], instructions[pc + 1]
+        if op == 0:
+            return f"a >>= {combo(operand)}"
+        elif op == 1:
+            return f"b ^= {operand}"
+        elif op == 2:
+            return f"b = {combo(operand)} & 7"
+        elif op == 3:
+            return f"if a:\n    pc = {operand}\n    continue"
+        elif op == 4:
+            return "b ^= c"
+        elif op == 5:
+            return f"out.append({combo(operand)} & 7)"
+        elif op == 6:
+            return f"b = a >> {combo(operand)}"
+        elif op == 7:
+            return f"c = a >> {combo(operand)}"
+        raise NotImplementedError(f"{op} @ {pc}")
+
+    targets = {0} | {
+        instructions[pc + 1]
+        for pc in range(0, len(instructions) - 1, 2)
+        if instructions[pc] == 3
+    }
+
+    lines = [
+        "def program(a, b=0, c=0):",
+        "    out = []",
+        "    pc = 0",
+        "    while True:",
+    ]
+    for target in sorted(targets):
+        lines.append(f"        if pc == {target}:")
+        for pc in range(target, len(instructions) - 1, 2):
+            for line in statement(pc).splitlines():
+                lines.append(f"            {line}")
+        lines.append("            return tuple(out)")
+    lines.append("        raise ValueError(f'jump to {pc}')")
+
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    program = namespace["program"]
+    program.source = "\n".join(lines)
+    return program
+
+
+def search_quine(instructions: tuple[int, ...]):
+    """
+    Smallest a for which the program outputs itself. Best-first by a, adding
+    one octal digit at a time while the output matches the end of the program.
+    Raise ValueError if there is no such a.
+    """
+    program = compile_program(instructions)
+    candidates = list(range(1, 8))
+    heapq.heapify(candidates)
+    while candidates:
+        a = heapq.heappop(candidates)
+        output = program(a)
+        if output == instructions:
+            return a
+        if output == instructions[-len(output) :]:
+            for i in range(8):
+                heapq.heappush(candidates, (a << 3) + i)
+    raise ValueError(f"no a makes {instructions} output itself")
+
+
 small_examples = """\
 If register C contains 9, the program 2,6 would set register B to 1.
 If register A contains 10, the program 5,0,5,1,5,4 would output 0,1,2.
@@ -182,7 +353,6 @@ def search(aprime):
         vmTry = replace(vmP, a=aTry)
         vmTry.run()
         if OUTPUT and OUTPUT == lInstructions[-len(OUTPUT) :]:
-            print(oct(aTry), OUTPUT)
             if OUTPUT == lInstructions:
                 print("Amazing")
                 return aTry
@@ -195,3 +365,37 @@ for i in range(1, 8):
     print(i)
     if search(i):
         break
+
+
+print("\nPart 2, compiled")
+begin = time.time_ns()
+answer = search_quine(vmP.instructions)
+end = time.time_ns()
+print(oct(answer), answer, f"in {(end-begin)/1e6:.02f}ms")
+
+program = compile_program(vmP.instructions)
+print(program.source)
+begin = time.time_ns()
+for a in range(100000):
+    program(a)
+end = time.time_ns()
+print(f"{100000 / ((end-begin)/1e9):.0f} register values per second")
+
+print("\nTrace")
+vmT = replace(vmP, trace=Trace())
+print(vmT.run())
+vmT.trace.report()
+
+
+def time_dispatch(table, count=2000):
+    begin = time.time_ns()
+    for a in range(count):
+        replace(vmP, a=a).run(table=table)
+    end = time.time_ns()
+    return (end - begin) / count
+
+
+print("\nDispatch")
+chain = time_dispatch(table=False)
+table = time_dispatch(table=True)
+print(f"if/elif {chain/1e3:.01f}µs per run, table {table/1e3:.01f}µs per run")
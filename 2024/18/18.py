@@ -1,14 +1,18 @@
 #!/usr/bin/env python
 
 import bisect
-import heapq
+import pathlib
 import sys
 import time
-from dataclasses import dataclass
-from typing import Any, Callable, Generator, Iterable
+from typing import Iterable
 
 import aocd
 
+# add flatgrid to path
+sys.path.append(str(pathlib.Path(__file__).parents[2]))
+
+import flatgrid
+
 sys.setrecursionlimit(10000)
 
 PRETTY = {
@@ -60,123 +64,31 @@ def parse(data):
 HORIZONTAL = 0
 VERTICAL = 1
 
+WALL = ord("#")
 
-@dataclass(order=True)
-class Node:
-    distance: int = sys.maxsize
-    coord: tuple = (0, 0)
-    visited: bool = False
-    letter: str = ""
-
-    def __hash__(self):
-        return hash(self.coord)
-
-    def reset(self):
-        self.visited = False
-        self.distance = sys.maxsize
-
-
-@dataclass
-class Grid:
-    nodes: dict[tuple, Node]
-    array: list[list[Node]]
-    start: Node
-    end: Node
-    prev: Node | None = None
-
-    def __init__(self, rows):
-        self.nodes = {}
-        self.array = []
-
-        def build(coord=(), letter="", **args):
-            node = Node(coord=coord, **args, letter=letter)
-            if letter == "S":
-                self.start = node
-            elif letter == "E":
-                self.end = node
-            self.nodes[node.coord] = node
-            return node
 
-        self.array = [
-            [build(coord=(x, y), letter=c) for (x, c) in enumerate(row)]
-            for (y, row) in enumerate(rows)
-        ]
-
-        # self.start.distance = 0
-
-    def neighbors(self, node: Node):
-        """
-        All neighbors for node.
-        """
-        x, y = node.coord
-        for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
-            nx, ny = x + dx, y + dy
-            if (nx, ny) in self.nodes:
-                yield self.nodes[(nx, ny)]
-
-    def outgoing(self, node: Node):
+class Grid(flatgrid.Grid):
+    def outgoing(self, node: int):
         """
         All nodes that can be reached by this node, plus cost.
         """
+        letters = self.letters
         for n in self.neighbors(node):
-            if n.letter != "#":
+            if letters[n] != WALL:
                 yield n, 1
 
     def display(
         self,
         pending=(),
         pathset0: Iterable[tuple[int, int]] = (),
-        pathset: Iterable[Node] = (),
+        pathset: Iterable[int] = (),
     ):
-        pathset0 = set(pathset0)
-        pathset = set(pathset)
-        pending = set(pending)
         print("\N{MOUNTAIN}")
-        for row in self.array:
-            for col in row:
-                print(PRETTY.get(col.letter), end="")
+        for y in range(self.height):
+            for x in range(self.width):
+                print(PRETTY.get(self.letter(self.index(x, y))), end="")
             print()
 
-    def shortest(
-        self,
-        start,
-        goal,
-        connected: Callable[[Node], Generator[tuple[Node, int], Any, None]],
-        show=False,
-    ):
-        # nodes.visited and nodes.distance should be reset before calling
-        display_distance = 0
-        unvisited = [(start.distance, start)]
-        while unvisited:
-            original_priority, node = heapq.heappop(unvisited)
-            if original_priority != node.distance:
-                continue
-            if node.visited:
-                continue
-            if display_distance < node.distance:
-                display_distance = node.distance
-                if show:
-                    print("\033[2J\033[H")  # clear screen and move to home
-                    self.display(n for _, n in unvisited)
-                    sys.stdout.flush()
-
-                    time.sleep(0.01)
-            node.visited = True
-
-            # Find distance for all
-            if node == goal:
-                break
-
-            for next, cost in connected(node):
-                if not next.visited:
-                    next.distance = min(node.distance + cost, next.distance)
-                    heapq.heappush(unvisited, (next.distance, next))
-
-    def reset(self):
-        for node in self.nodes.values():
-            node.reset()
-        self.start.distance = 0
-
 
 def ex():
     size = 7  # from 0 to 6 inclusive
@@ -186,27 +98,25 @@ def ex():
             yield "." * size
 
     g = Grid(grid())
-    print(g.nodes)
-    g.start = g.nodes[(0, 0)]
-    g.end = g.nodes[(5, 5)]
-    g.start.distance = 0
+    g.start = g.index(0, 0)
+    g.end = g.index(5, 5)
 
     g.display()
-    g.shortest(g.start, g.end, g.outgoing)
+    g.shortest(g.start, g.outgoing, g.end)
     g.display()
 
-    print(g.end.distance)
+    print(g.distance(g.end))
 
     g.reset()
 
     for coord in list(parse(example))[:12]:
-        g.nodes[coord].letter = "#"
+        g.letters[g.index(*coord)] = WALL
 
     g.display()
 
-    g.shortest(g.start, g.end, g.outgoing)
+    g.shortest(g.start, g.outgoing, g.end)
 
-    print(g.end.distance)
+    print(g.distance(g.end))
 
 
 ex()
@@ -218,28 +128,26 @@ def pt1(input, corruption, size=71):
             yield "." * size
 
     g = Grid(grid())
-    # print(g.nodes)
 
-    g.start = g.nodes[(0, 0)]
-    g.end = g.nodes[(size - 1, size - 1)]
-    g.start.distance = 0
+    g.start = g.index(0, 0)
+    g.end = g.index(size - 1, size - 1)
 
     # g.display()
-    # g.shortest(g.start, g.end, g.outgoing)
+    # g.shortest(g.start, g.outgoing, g.end)
     # g.display()
 
-    # print(g.end.distance)
+    # print(g.distance(g.end))
 
     # g.reset()
 
     for coord in input[:corruption]:
-        g.nodes[coord].letter = "#"
+        g.letters[g.index(*coord)] = WALL
 
     # g.display()
 
-    g.shortest(g.start, g.end, g.outgoing)
+    g.shortest_buckets(g.start, g.outgoing, g.end)
 
-    return g.end.distance
+    return g.distance(g.end)
 
 
 def pt2(start=1024):
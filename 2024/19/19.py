@@ -6,6 +6,14 @@ Arranging towels.
 import aocd
 import dataclasses
 import functools
+import pathlib
+import sys
+import time
+
+# add parallel to path
+sys.path.append(str(pathlib.Path(__file__).parents[2]))
+
+from parallel import pmap
 
 example = """\
 r, wr, b, g, bwu, rb, gb, br
@@ -107,6 +115,62 @@ def part2(data, debug=True):
     return ans
 
 
+def part2_parallel(data):
+    p = parse(data)
+    ways, cache_info = pmap(functools.partial(count, towels=p.towels), p.patterns)
+    print(cache_info)
+    return sum(ways)
+
+
+class TowelIndex:
+    """
+    Trie of towels, built once. Node 0 is the root; children[node] maps the
+    next stripe to a node and towel[node] is set where a towel ends.
+    """
+
+    def __init__(self, towels):
+        self.children: list[dict[int, int]] = [{}]
+        self.towel: list[bool] = [False]
+        for towel in towels:
+            node = 0
+            for stripe in towel.encode():
+                child = self.children[node].get(stripe)
+                if child is None:
+                    child = self.children[node][stripe] = len(self.children)
+                    self.children.append({})
+                    self.towel.append(False)
+                node = child
+            self.towel[node] = True
+
+    def count(self, pattern: str):
+        """
+        Ways to make pattern. ways[i] counts the ways to make its first i
+        stripes; each is carried along every towel that starts at i.
+        """
+        stripes = pattern.encode()
+        ways = [0] * (len(stripes) + 1)
+        ways[0] = 1
+        children, towel = self.children, self.towel
+        for start in range(len(stripes)):
+            here = ways[start]
+            if not here:
+                continue
+            node = 0
+            for end in range(start, len(stripes)):
+                node = children[node].get(stripes[end])
+                if node is None:
+                    break
+                if towel[node]:
+                    ways[end + 1] += here
+        return ways[-1]
+
+    def count_all(self, patterns):
+        return [self.count(pattern) for pattern in patterns]
+
+
+ex = parse(example)
+assert TowelIndex(ex.towels).count_all(ex.patterns) == [2, 1, 4, 6, 0, 1, 2, 0]
+
 part1()
 print()
 
@@ -117,3 +181,13 @@ print()
 print("Part 2, full input")
 ans2 = part2(aocd.data, debug=False)
 print(f"{ans2} ways")
+
+print("Part 2, in parallel")
+print(f"{part2_parallel(aocd.data)} ways")
+
+print("Part 1 and 2, trie")
+begin = time.time_ns()
+p = parse(aocd.data)
+ways = TowelIndex(p.towels).count_all(p.patterns)
+end = time.time_ns()
+print(sum(map(bool, ways)), f"{sum(ways)} ways in {(end-begin)/1e6:.02f}ms")
@@ -1,15 +1,18 @@
 #!/usr/bin/env python
 
 import collections
-import heapq
+import pathlib
 import pprint
 import sys
-import time
-from dataclasses import dataclass
-from typing import Any, Callable, Generator, Iterable
+from typing import Iterable
 
 import aocd
 
+# add flatgrid to path
+sys.path.append(str(pathlib.Path(__file__).parents[2]))
+
+import flatgrid
+
 PRETTY = {
     ".": "\N{FULLWIDTH FULL STOP}",
     "#": "🧱",
@@ -26,6 +29,8 @@ def parse(data):
 HORIZONTAL = 0
 VERTICAL = 1
 
+WALL = ord("#")
+
 
 class V(tuple):
     def __new__(cls, *args):
@@ -45,137 +50,47 @@ class V(tuple):
         return f"V{str((*self,))}"
 
 
-@dataclass(order=True)
-class Node:
-    distance: int = sys.maxsize
-    coord: V = V(0, 0)
-    visited: bool = False
-    letter: str = ""
-
-    def __hash__(self):
-        return hash(self.coord)
-
-    def reset(self):
-        self.visited = False
-        self.distance = sys.maxsize
-
-
-@dataclass
-class Grid:
-    nodes: dict[tuple, Node]
-    array: list[list[Node]]
-    start: Node
-    end: Node
-    prev: Node | None = None
-
+class Grid(flatgrid.Grid):
     def __init__(self, rows: str | list[str]):
-        self.nodes = {}
-        self.array = []
-
-        if isinstance(rows, str):
-            rows = rows.splitlines()
-
-        def build(coord=(), letter="", **args):
-            node = Node(coord=coord, **args, letter=letter)
-            if letter == "S":
-                self.start = node
-            elif letter == "E":
-                self.end = node
-            self.nodes[node.coord] = node
-            return node
-
-        self.array = [
-            [build(coord=V(x, y), letter=c) for (x, c) in enumerate(row)]
-            for (y, row) in enumerate(rows)
-        ]
-
-    def neighbors(self, node: Node):
-        """
-        All neighbors for node.
-        """
-        x, y = node.coord
-        for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
-            nx, ny = x + dx, y + dy
-            if (nx, ny) in self.nodes:
-                yield self.nodes[(nx, ny)]
+        super().__init__(rows)
+        self.start = self.find("S")
+        self.end = self.find("E")
 
-    def taxis(self, node: Node, radius: int = 1):
+    def taxis(self, node: int, radius: int = 1):
         radius += 1
-        x, y = node.coord
+        x, y = self.coord(node)
         for dy in range(-radius, radius):
             sideways = radius - abs(dy)
             for dx in range(-sideways + 1, sideways):
                 x1, y1 = x + dx, y + dy
-                if (x1, y1) in self.nodes:
-                    yield self.nodes[(x1, y1)]
+                if 0 <= x1 < self.width and 0 <= y1 < self.height:
+                    yield self.index(x1, y1)
 
-    def outgoing(self, node: Node):
+    def outgoing(self, node: int):
         """
         All nodes that can be reached by this node, plus cost.
         """
+        letters = self.letters
         for n in self.neighbors(node):
-            if n.letter != "#":
+            if letters[n] != WALL:
                 yield n, 1
 
     def display(
         self,
         pending=(),
         pathset0: Iterable[tuple[int, int]] = (),
-        pathset: Iterable[Node] = (),
+        pathset: Iterable[int] = (),
     ):
-        pathset0 = set(pathset0)
-        pathset = set(pathset)
         pending = set(pending)
         print("\N{MOUNTAIN}")
-        for row in self.array:
-            for col in row:
-                letter = col.letter
-                if col.coord in pending:
+        for y in range(self.height):
+            for x in range(self.width):
+                letter = self.letter(self.index(x, y))
+                if (x, y) in pending:
                     letter = "*"
                 print(PRETTY.get(letter), end="")
             print()
 
-    def shortest(
-        self,
-        start,
-        goal,
-        connected: Callable[[Node], Generator[tuple[Node, int], Any, None]],
-        show=False,
-        stop_at_goal=False,
-    ):
-        # nodes.visited and nodes.distance should be reset before calling
-        display_distance = 0
-        start.distance = 0
-        unvisited = [(start.distance, start)]
-        while unvisited:
-            original_priority, node = heapq.heappop(unvisited)
-            if original_priority != node.distance:
-                continue
-            if node.visited:
-                continue
-            if display_distance < node.distance:
-                display_distance = node.distance
-                if show:
-                    print("\033[2J\033[H")  # clear screen and move to home
-                    self.display(n for _, n in unvisited)
-                    sys.stdout.flush()
-
-                    time.sleep(0.01)
-            node.visited = True
-
-            # Find distance for all
-            if stop_at_goal and node == goal:
-                break
-
-            for next, cost in connected(node):
-                if not next.visited:
-                    next.distance = min(node.distance + cost, next.distance)
-                    heapq.heappush(unvisited, (next.distance, next))
-
-    def reset(self):
-        for node in self.nodes.values():
-            node.reset()
-
 
 example = """\
 ###############
@@ -202,18 +117,14 @@ def part1():
 
     # the forwards version
     # there is only one path through the maze, so we don't need both forward and reverse!
-    grid.shortest(grid.start, grid.end, grid.outgoing)
+    grid.shortest_buckets(grid.start, grid.outgoing)
 
     counter = collections.Counter()
 
-    for node in grid.nodes.values():
-        if node.letter != "#":
+    for node in range(grid.size):
+        if grid.letters[node] != WALL:
             continue
 
-        if node.coord == (4, 1):
-            # import pdb; pdb.set_trace()
-            pass
-
         try:
             left, right, above, below = (*grid.neighbors(node),)
         except ValueError:
@@ -222,10 +133,10 @@ def part1():
 
         for a, b in (left, right), (above, below):
             # (right, left), (above, below), (below, above):
-            if a.letter == "#" or b.letter == "#":
+            if grid.letters[a] == WALL or grid.letters[b] == WALL:
                 continue  # watch out for sys.maxint
             # Subtract 2 steps taken to cross the shortcut, Buckaroo Banzai style
-            shortcut = abs(a.distance - b.distance) - 2
+            shortcut = abs(grid.distance(a) - grid.distance(b)) - 2
             if (
                 shortcut > 0 and shortcut.bit_length() < 16
             ):  # supre long shortcuts still?
@@ -253,7 +164,7 @@ def part2():
 
     grid = Grid(example)
     for radius in range(3):
-        nodes = set(x.coord for x in grid.taxis(grid.nodes[(8, 8)], radius))
+        nodes = set(grid.coord(x) for x in grid.taxis(grid.index(8, 8), radius))
         grid.display(nodes)
         input(f"Radius {radius}")
 
@@ -263,27 +174,27 @@ def part2():
     grid.display()
 
     # the forwards version
-    grid.shortest(grid.start, grid.end, grid.outgoing)
+    grid.shortest_buckets(grid.start, grid.outgoing)
 
     counter = collections.Counter()
     seen = set()
-    for node in grid.nodes.values():
-        if node.letter not in ".SE":
+    for node in range(grid.size):
+        if grid.letters[node] == WALL:
             continue
 
         for cheat_end in grid.taxis(node, radius=20):
-            cheat_id = frozenset((node.coord, cheat_end.coord))
-            if cheat_end.letter == "#" or cheat_end == node or cheat_id in seen:
+            cheat_id = frozenset((node, cheat_end))
+            if grid.letters[cheat_end] == WALL or cheat_end == node or cheat_id in seen:
                 continue
-            # print("Consider", node.coord, cheat_end.coord)
+            # print("Consider", grid.coord(node), grid.coord(cheat_end))
             seen.add(cheat_id)
 
-            shortcut = abs(node.distance - cheat_end.distance)
-            shortcut_penalty = (node.coord - cheat_end.coord).taxi()
+            shortcut = abs(grid.distance(node) - grid.distance(cheat_end))
+            shortcut_penalty = (V(*grid.coord(node)) - V(*grid.coord(cheat_end))).taxi()
             shortcut -= shortcut_penalty
             # print("Shortcut", shortcut, "Penalty", shortcut_penalty)
 
-            # ex.display((node.coord, cheat_end.coord))
+            # ex.display((grid.coord(node), grid.coord(cheat_end)))
 
             if (
                 shortcut > 0 and shortcut.bit_length() < 16
@@ -7,12 +7,17 @@ codes.
 
 import functools
 import itertools
+import pathlib
 import sys
-from dataclasses import dataclass
 from typing import Iterable
 
 import aocd
 
+# add flatgrid to path
+sys.path.append(str(pathlib.Path(__file__).parents[2]))
+
+import flatgrid
+
 numbers = """\
 789
 456
@@ -42,6 +47,8 @@ FILLER = "\N{FULLWIDTH FULL STOP}"
 # 0,0 is top left; coordinates increase going right, and going down.
 DIRECTIONS = {(-1, 0): "<", (1, 0): ">", (0, -1): "^", (0, 1): "v"}
 
+GAP = ord(" ")
+
 # bottom keypad pathfinding to next keypad...
 # graphs...
 # problem segments...
@@ -59,104 +66,48 @@ DIRECTIONS = {(-1, 0): "<", (1, 0): ">", (0, -1): "^", (0, 1): "v"}
 # Robot 1 numeric keypad
 
 
-@dataclass(order=True)
-class Node:
-    coord: tuple = (0, 0)
-    letter: str = ""
-    visited: bool = False
-    distance: int = sys.maxsize
-
-    def __hash__(self):
-        return hash(self.coord)
-
-    def reset(self):
-        self.visited = False
-        self.distance = sys.maxsize
-
-    def __str__(self):
-        return f"{self.__class__.__name__}({self.letter})"
-
-
-class NodeList(list):
-    def __str__(self):
-        return ",".join(el.letter for el in self)
-
-
-@dataclass
-class Grid:
-    nodes: frozenset[Node]
-    array: list[list[Node]]
-    start: Node
-    end: Node
-    prev: Node | None = None
-
+class Grid(flatgrid.Grid):
     def __init__(self, rows):
-        nodes = set()
-        self.array = []
-
-        def build(letter="", **args):
-            node = Node(**args, letter=letter)
-            if letter == "A":
-                self.start = node
-            nodes.add(node)
-            return node
-
-        self.array = [
-            [build(coord=(x, y), letter=c) for (x, c) in enumerate(row)]
-            for (y, row) in enumerate(rows)
-        ]
-
-        self.start.distance = 0
-
-        self.nodes = frozenset(nodes)
-
-    def __hash__(self):
-        return hash(self.nodes)
+        super().__init__(rows)
+        self.start = self.find("A")
 
-    def neighbors(self, node: Node):
+    def neighbors(self, node: int):
         """
         All neighbors for node.
         """
-        x, y = node.coord
-        for dx, dy in (-1, 0), (1, 0), (0, -1), (0, 1):
-            nx, ny = x + dx, y + dy
-            if nx < 0 or ny < 0:
+        x, y = self.coord(node)
+        for n in self.adjacent[node]:
+            if self.letters[n] == GAP:
                 continue
-            try:
-                candidate = self.array[y + dy][x + dx]
-                if candidate.letter == " ":
-                    continue
-                yield candidate, (dx, dy)
-            except IndexError:
-                pass
+            nx, ny = self.coord(n)
+            yield n, (nx - x, ny - y)
 
     def display(
         self,
         pending=(),
         pathset0: Iterable[tuple[int, int]] = (),
-        pathset: Iterable[Node] = (),
+        pathset: Iterable[int] = (),
     ):
-        pathset0 = set(pathset0)
-        pathset = set(pathset)
         pending = set(pending)
         print("\N{CHEESE WEDGE}")
-        for row in self.array:
-            for col in row:
+        for y in range(self.height):
+            for x in range(self.width):
+                col = self.index(x, y)
                 if col in pending:
                     char = "+"
-                elif col.visited:
+                elif self.visited(col):
                     # print(" ", end="")
-                    char = chr(ord("0") + col.distance % 10)
+                    char = chr(ord("0") + self.distance(col) % 10)
                 else:
-                    char = col.letter
+                    char = self.letter(col)
                 print(PRETTY.get(char, FILLER), end="")
             print()
 
-    def distinct_paths(self, start: Node, connected, goal: str, path: list):
+    def distinct_paths(self, start: int, connected, goal: str, path: list):
         """
         Distinct paths to goal from start using 'connected' function to find neighbors.
         """
-        if start.letter == goal:
+        if self.letter(start) == goal:
             yield path
         for next, _ in connected(start):
             if next in path:
@@ -165,9 +116,9 @@ class Grid:
 
     def paths_between(self, start: str, goal: str):
         """
-        Distinct paths, easy version using letters not Node()
+        Distinct paths, easy version using letters not cell numbers
         """
-        begin = next(n for n in self.nodes if n.letter == start)
+        begin = self.find(start)
         yield from self.distinct_paths(begin, self.neighbors, goal, [begin])
 
     def shortest_paths_between(self, start: str, goal: str):
@@ -175,39 +126,38 @@ class Grid:
         # OR favor consecutive same-button presses
         all_paths_between = list(self.paths_between(start, goal))
         shortest = min(len(p) for p in all_paths_between)
-        return [NodeList(p) for p in all_paths_between if len(p) == shortest]
+        return [p for p in all_paths_between if len(p) == shortest]
 
     @functools.cache
-    def direction_between(self, start: str, goal: str):
+    def direction_between(self, start: str | int, goal: str | int):
         """
         Return arrow direction between two adjacent characters on the pad.
         """
-        if isinstance(start, Node):
-            start = start.letter
-        if isinstance(goal, Node):
-            goal = goal.letter
-        begin = next(n for n in self.nodes if n.letter == start)
+        if isinstance(start, int):
+            start = self.letter(start)
+        if isinstance(goal, int):
+            goal = self.letter(goal)
+        begin = self.find(start)
         for n, direction in self.neighbors(begin):
-            if n.letter == goal:
+            if self.letter(n) == goal:
                 return direction
         raise ValueError(f"{start},{goal} not adjacent")
 
-    def reset(self):
-        for node in self.nodes:
-            node.reset()
+    def path_letters(self, path: list[int]):
+        return ",".join(self.letter(n) for n in path)
 
 
 keypad = Grid(numbers)
 keypad.display(())
 print("\nPaths between A and 9:")
 for path in keypad.paths_between("A", "9"):
-    print(",".join(n.letter for n in path))
+    print(keypad.path_letters(path))
 
 print(f"\nCode {example[0]}")
 for a, b in zip(example[0], example[0][1:]):
     print(f"Shortest paths between {a} and {b}")
     for path in keypad.shortest_paths_between(a, b):
-        print(",".join(n.letter for n in path))
+        print(keypad.path_letters(path))
     print()
 
 
@@ -257,11 +207,11 @@ def explodeN(start, next, keypads):
             pass
 
 
-def distinct_paths(self, start: Node, connected, goal: str, path: list):
+def distinct_paths(self, start: int, connected, goal: str, path: list):
     """
     Distinct paths to goal from start using 'connected' function to find neighbors.
     """
-    if start.letter == goal:
+    if self.letter(start) == goal:
         yield path
     for next, _ in connected(start):
         if next in path:
@@ -8,6 +8,8 @@ import re
 from pathlib import Path
 
 import aocd
+import numpy as np
+import time
 
 example = """7,1
 11,1
@@ -51,3 +53,94 @@ def svg(coords):
 Path("debug.svg").write_text(svg(coords))
 
 print(max(coords))
+
+
+## NumPy engine
+
+# Areas are computed a tile of rows at a time against every other red tile.
+# For part 2, every distinct x and every gap between neighbouring distinct xs
+# becomes one compressed column (likewise rows), so the loop is a small grid
+# and a 2-D prefix sum counts outside cells under any rectangle in O(1).
+
+
+def largest_area(points: np.ndarray, allowed=None, block: int | None = None):
+    """
+    Largest rectangle with red tiles at opposite corners. If given,
+    allowed(i, j) masks the pairs (index arrays, broadcast) that count.
+    """
+    n = len(points)
+    block = block or max(1, 2**16 // n)
+    best = 0
+    for start in range(0, n, block):
+        i = np.arange(start, min(start + block, n))[:, None]
+        j = np.arange(n)[None, :]
+        width = np.abs(points[i, 0] - points[j, 0]) + 1
+        height = np.abs(points[i, 1] - points[j, 1]) + 1
+        area = width * height
+        if allowed is not None:
+            area = np.where(allowed(i, j), area, 0)
+        best = max(best, int(area.max()))
+    return best
+
+
+def compress(values: np.ndarray):
+    """
+    Distinct values and the compressed index of each value: 2k for the kth
+    distinct value, 2k + 1 for the gap after it.
+    """
+    distinct = np.unique(values)
+    return distinct, 2 * np.searchsorted(distinct, values)
+
+
+class Floor:
+    def __init__(self, points: np.ndarray):
+        self.xs, self.columns = compress(points[:, 0])
+        self.ys, self.rows = compress(points[:, 1])
+        height, width = 2 * len(self.ys) - 1, 2 * len(self.xs) - 1
+
+        boundary = np.zeros((height, width), dtype=bool)
+        # a vertical edge toggles inside/outside for every cell to its right,
+        # on rows from its low end up to (not including) its high end
+        crossings = np.zeros((height + 1, width + 1), dtype=np.int32)
+        r0, c0 = self.rows, self.columns
+        r1, c1 = np.roll(r0, -1), np.roll(c0, -1)
+        for r0, c0, r1, c1 in zip(*(a.tolist() for a in (r0, c0, r1, c1))):
+            (r0, r1), (c0, c1) = sorted((r0, r1)), sorted((c0, c1))
+            boundary[r0 : r1 + 1, c0 : c1 + 1] = True
+            if c0 == c1:
+                crossings[r0, c0 + 1] += 1
+                crossings[r1, c0 + 1] -= 1
+        crossings = crossings.cumsum(axis=0).cumsum(axis=1)[:height, :width]
+
+        inside = boundary | (crossings % 2 == 1)
+        # gaps between neighbouring values hold no tiles
+        inside[1::2][np.diff(self.ys) == 1] = True
+        inside[:, 1::2][:, np.diff(self.xs) == 1] = True
+        self.inside = inside
+
+        self.outside = np.zeros((height + 1, width + 1), dtype=np.int64)
+        self.outside[1:, 1:] = (~inside).cumsum(axis=0).cumsum(axis=1)
+
+    def contains(self, i, j):
+        """
+        True where the rectangle between points i and j is all red or green.
+        """
+        r0 = np.minimum(self.rows[i], self.rows[j])
+        r1 = np.maximum(self.rows[i], self.rows[j]) + 1
+        c0 = np.minimum(self.columns[i], self.columns[j])
+        c1 = np.maximum(self.columns[i], self.columns[j]) + 1
+        o = self.outside
+        return o[r1, c1] - o[r0, c1] - o[r1, c0] + o[r0, c0] == 0
+
+
+points = np.array(list(parse(example)), dtype=np.int64)
+assert largest_area(points) == 50
+assert largest_area(points, Floor(points).contains) == 24
+
+points = np.array(coords, dtype=np.int64)
+begin = time.time_ns()
+print("Part 1", largest_area(points))
+floor = Floor(points)
+print("Part 2", largest_area(points, floor.contains))
+end = time.time_ns()
+print(f"{floor.inside.shape} compressed floor, both parts in {(end-begin)/1e6:.02f}ms")
@@ -0,0 +1,235 @@
+"""
+Flat, array-backed grid shared by the maze days.
+
+Cells are plain ints, ``y * width + x``. Letters, distances and visited flags
+live in parallel arrays indexed by that int instead of on per-cell objects.
+Searches over (cell, orientation) states use ``layers``; a state is
+``layer * size + cell``.
+
+Distances and visited flags are stamped with a generation number, so ``reset()``
+is O(1): bumping the generation makes every old stamp stale.
+
+Import from a day's directory with::
+
+    sys.path.append(str(pathlib.Path(__file__).parents[2]))
+    import flatgrid
+"""
+
+import heapq
+import sys
+import time
+from array import array
+from typing import Callable, Iterable, Iterator
+
+INFINITY = sys.maxsize
+
+# 0,0 is top left; coordinates increase going right, and going down.
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+Connected = Callable[[int], Iterable[tuple[int, int]]]
+
+
+class Grid:
+    letters: bytearray
+    width: int
+    height: int
+    size: int
+    layers: int
+
+    def __init__(self, rows: str | Iterable[str], layers: int = 1, fill: str = " "):
+        if isinstance(rows, str):
+            rows = rows.splitlines()
+        rows = list(rows)
+
+        self.height = len(rows)
+        self.width = max((len(row) for row in rows), default=0)
+        self.size = self.width * self.height
+        self.layers = layers
+
+        self.letters = bytearray(
+            b"".join(row.ljust(self.width, fill).encode() for row in rows)
+        )
+
+        # Neighbor offsets, clipped at the edges once instead of on every visit.
+        self.adjacent: list[tuple[int, ...]] = [
+            tuple(
+                (y + dy) * self.width + x + dx
+                for dx, dy in DIRECTIONS
+                if 0 <= x + dx < self.width and 0 <= y + dy < self.height
+            )
+            for y in range(self.height)
+            for x in range(self.width)
+        ]
+
+        states = self.size * layers
+        self.distances = array("q", [INFINITY]) * states
+        self.stamps = array("L", [0]) * states
+        self.visits = array("L", [0]) * states
+        self.generation = 1
+
+    def index(self, x: int, y: int, layer: int = 0) -> int:
+        return layer * self.size + y * self.width + x
+
+    def coord(self, state: int) -> tuple[int, int]:
+        y, x = divmod(state % self.size, self.width)
+        return x, y
+
+    def cell(self, state: int) -> int:
+        return state % self.size
+
+    def layer(self, state: int) -> int:
+        return state // self.size
+
+    def letter(self, state: int) -> str:
+        return chr(self.letters[state % self.size])
+
+    def find(self, letter: str) -> int:
+        """
+        First cell with letter.
+        """
+        return self.letters.index(ord(letter))
+
+    def find_all(self, letter: str) -> Iterator[int]:
+        code = ord(letter)
+        return (i for i, c in enumerate(self.letters) if c == code)
+
+    def neighbors(self, state: int) -> Iterator[int]:
+        """
+        All neighbors for state, in the same layer.
+        """
+        base = state - state % self.size
+        for n in self.adjacent[state - base]:
+            yield base + n
+
+    def distance(self, state: int) -> int:
+        if self.stamps[state] != self.generation:
+            return INFINITY
+        return self.distances[state]
+
+    def set_distance(self, state: int, distance: int):
+        self.distances[state] = distance
+        self.stamps[state] = self.generation
+
+    def visited(self, state: int) -> bool:
+        return self.visits[state] == self.generation
+
+    def reached(self) -> Iterator[int]:
+        """
+        All states with a finite distance since the last reset.
+        """
+        generation = self.generation
+        return (i for i, stamp in enumerate(self.stamps) if stamp == generation)
+
+    def reset(self):
+        self.generation += 1
+
+    def display(self, pending: Iterable[int] = ()):
+        pending = set(pending)
+        for y in range(self.height):
+            row = self.letters[y * self.width : (y + 1) * self.width].decode()
+            print(
+                "".join(
+                    "+" if y * self.width + x in pending else c
+                    for x, c in enumerate(row)
+                )
+            )
+
+    def shortest(
+        self,
+        start: int | Iterable[int],
+        connected: Connected,
+        goal: int | None = None,
+        show=False,
+    ):
+        """
+        Dijkstra from start (one state or several) using 'connected' to yield
+        (state, cost) pairs. Distances are left in the grid; call reset()
+        before searching again.
+        """
+        distances = self.distances
+        stamps = self.stamps
+        visits = self.visits
+        generation = self.generation
+
+        if isinstance(start, int):
+            start = (start,)
+        unvisited = []
+        for s in start:
+            distances[s] = 0
+            stamps[s] = generation
+            unvisited.append((0, s))
+
+        display_distance = 0
+        while unvisited:
+            distance, node = heapq.heappop(unvisited)
+            if visits[node] == generation:
+                continue
+            if show and display_distance < distance:
+                display_distance = distance
+                print("\033[2J\033[H")  # clear screen and move to home
+                self.display(n for _, n in unvisited)
+                sys.stdout.flush()
+                time.sleep(0.01)
+
+            visits[node] = generation
+            if node == goal:
+                break
+
+            for next, cost in connected(node):
+                if visits[next] == generation:
+                    continue
+                candidate = distance + cost
+                if stamps[next] != generation or candidate < distances[next]:
+                    distances[next] = candidate
+                    stamps[next] = generation
+                    heapq.heappush(unvisited, (candidate, next))
+
+    def shortest_buckets(
+        self,
+        start: int | Iterable[int],
+        connected: Connected,
+        goal: int | None = None,
+    ):
+        """
+        The same search as shortest(), but as a bucket queue: one list of
+        states per distance, and a heap of the distinct distances only. Costs
+        must be non-negative ints. Nodes are never compared, and with small
+        integer costs there are far fewer distances than states to heapify.
+        """
+        distances = self.distances
+        stamps = self.stamps
+        visits = self.visits
+        generation = self.generation
+
+        start = [start] if isinstance(start, int) else list(start)
+        buckets = {0: list(start)}
+        for s in start:
+            distances[s] = 0
+            stamps[s] = generation
+        keys = [0]
+
+        while keys:
+            distance = heapq.heappop(keys)
+            bucket = buckets[distance]
+            # zero-cost edges append to the bucket being drained
+            while bucket:
+                node = bucket.pop()
+                if visits[node] == generation or distances[node] != distance:
+                    continue
+                visits[node] = generation
+                if node == goal:
+                    return
+
+                for next, cost in connected(node):
+                    if visits[next] == generation:
+                        continue
+                    candidate = distance + cost
+                    if stamps[next] != generation or candidate < distances[next]:
+                        distances[next] = candidate
+                        stamps[next] = generation
+                        if candidate in buckets:
+                            buckets[candidate].append(next)
+                        else:
+                            buckets[candidate] = [next]
+                            heapq.heappush(keys, candidate)
+            del buckets[distance]
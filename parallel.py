@@ -0,0 +1,114 @@
+"""
+Process-pool map for days that solve many independent items one at a time.
+
+Import from a day's directory with::
+
+    sys.path.append(str(pathlib.Path(__file__).parents[2]))
+    from parallel import pmap
+
+    answers, cache_info = pmap(solver, items)
+
+solver is called with one item and must be picklable: a module-level function,
+or a functools.partial of one. Workers are forked, so a day's module-level
+state (parsed input, globals) is already there and the script is not re-run.
+Where fork isn't available (Windows) or isn't safe (macOS), pmap runs serially
+instead: spawned workers would re-import the day script, which does all its
+work at module level. Pass serial=True, or set AOC_SERIAL=1, to run everything
+in this process for debugging.
+
+Cache statistics only count this call's work, in either mode: a cache warmed
+before pmap (and inherited by forked workers) isn't counted again.
+"""
+
+import functools
+import multiprocessing
+import os
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+def cache_info(cached: Callable | None):
+    """
+    functools.cache statistics for cached, looking through partials.
+    """
+    while isinstance(cached, functools.partial):
+        cached = cached.func
+    info = getattr(cached, "cache_info", None)
+    # functools' own CacheInfo can't be pickled back from a worker
+    return CacheInfo(*info()) if info else None
+
+
+def _delta(before: CacheInfo, after: CacheInfo):
+    return CacheInfo(
+        after.hits - before.hits,
+        after.misses - before.misses,
+        after.maxsize,
+        after.currsize - before.currsize,
+    )
+
+
+def _solve_chunk(solver: Callable, cached: Callable | None, chunk: list):
+    before = cache_info(cached)
+    results = [solver(item) for item in chunk]
+    return os.getpid(), results, before, cache_info(cached)
+
+
+def pmap(
+    solver: Callable[[Any], Any],
+    items: Iterable,
+    chunksize: int | None = None,
+    workers: int | None = None,
+    serial=False,
+    cached: Callable | None = None,
+) -> tuple[list, CacheInfo | None]:
+    """
+    [solver(item) for item in items] over a process pool, in order.
+
+    Also return the cache statistics of cached (default: solver) for this
+    call, summed over every worker, or None if it has no cache_info().
+    """
+    items = list(items)
+    cached = cached or solver
+
+    # spawned workers would re-run the calling script; fork is unsafe on macOS
+    fork = "fork" in multiprocessing.get_all_start_methods()
+    if serial or not fork or sys.platform == "darwin" or os.environ.get("AOC_SERIAL"):
+        before = cache_info(cached)
+        results = [solver(item) for item in items]
+        return results, before and _delta(before, cache_info(cached))
+
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        # a few chunks per worker evens out uneven items
+        chunksize = max(1, -(-len(items) // (workers * 4)))
+    chunks = [items[i : i + chunksize] for i in range(0, len(items), chunksize)]
+
+    context = multiprocessing.get_context("fork")
+
+    results = []
+    hits = misses = 0
+    maxsize = None
+    base = {}
+    sizes = {}
+    with ProcessPoolExecutor(
+        min(workers, len(chunks) or 1), mp_context=context
+    ) as pool:
+        solve = functools.partial(_solve_chunk, solver, cached)
+        for pid, chunk_results, before, after in pool.map(solve, chunks):
+            results.extend(chunk_results)
+            if after:
+                hits += after.hits - before.hits
+                misses += after.misses - before.misses
+                maxsize = after.maxsize
+                # caches live on in each worker between chunks, and each
+                # starts with whatever the parent had cached before forking
+                base.setdefault(pid, before.currsize)
+                sizes[pid] = max(sizes.get(pid, 0), after.currsize - base[pid])
+
+    if not sizes:
+        return results, None
+    return results, CacheInfo(hits, misses, maxsize, sum(sizes.values()))